@@ -0,0 +1,38 @@
+"""Keyset pagination indexes
+
+Revision ID: 3b9e4d2a7c51
+Revises: 6c3f30e3e6d0
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e4d2a7c51"
+down_revision: Union[str, Sequence[str], None] = "6c3f30e3e6d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_articles_created_at_id", "articles", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_comments_article_id_created_at_id",
+        "comments",
+        ["article_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_article_id_created_at_id", table_name="comments")
+    op.drop_index("ix_articles_created_at_id", table_name="articles")
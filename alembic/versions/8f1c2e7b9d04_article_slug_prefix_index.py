@@ -0,0 +1,37 @@
+"""Article slug prefix index
+
+Revision ID: 8f1c2e7b9d04
+Revises: 3b9e4d2a7c51
+Create Date: 2026-10-18 11:40:05.118342
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f1c2e7b9d04"
+down_revision: Union[str, Sequence[str], None] = "3b9e4d2a7c51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # varchar_pattern_ops сравнивает побайтово: скан по префиксу slug
+    # (операторы ~>=~ / ~<~) не зависит от collation базы
+    op.create_index(
+        "ix_articles_slug_pattern",
+        "articles",
+        ["slug"],
+        unique=False,
+        postgresql_ops={"slug": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_articles_slug_pattern", table_name="articles")
@@ -0,0 +1,46 @@
+"""Comments (created_at, id) index for exports
+
+Revision ID: a7d3c9e2f415
+Revises: e5a93b1f0c28
+Create Date: 2026-10-18 18:40:52.613094
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3c9e2f415"
+down_revision: Union[str, Sequence[str], None] = "e5a93b1f0c28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Выгрузка комментариев (и её продолжение с курсора) идёт по всей
+    # таблице в порядке (created_at, id); без индекса это полная сортировка.
+    # CONCURRENTLY — как в e5a93b1f0c28
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_created_at_id",
+            "comments",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_comments_created_at_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
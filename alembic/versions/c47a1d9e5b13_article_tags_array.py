@@ -0,0 +1,174 @@
+"""Article tags array and tag counts
+
+Revision ID: c47a1d9e5b13
+Revises: 8f1c2e7b9d04
+Create Date: 2026-10-18 13:05:52.774019
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c47a1d9e5b13"
+down_revision: Union[str, Sequence[str], None] = "8f1c2e7b9d04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Строка "a,b,c" -> массив {a,b,c}
+    op.alter_column(
+        "articles",
+        "tag_list",
+        type_=postgresql.ARRAY(sa.String()),
+        existing_type=sa.String(length=500),
+        postgresql_using=(
+            "CASE WHEN tag_list IS NULL OR tag_list = '' THEN '{}'::varchar[] "
+            "ELSE string_to_array(tag_list, ',')::varchar[] END"
+        ),
+    )
+    # Повторы тегов внутри статьи (сохраняя порядок первого вхождения)
+    op.execute("""
+        UPDATE articles
+        SET tag_list = ARRAY(
+            SELECT t FROM unnest(tag_list) WITH ORDINALITY AS u(t, n)
+            GROUP BY t ORDER BY min(n)
+        )
+        WHERE cardinality(tag_list) <> (
+            SELECT count(DISTINCT t) FROM unnest(tag_list) AS t
+        )
+        """)
+    op.alter_column(
+        "articles",
+        "tag_list",
+        existing_type=postgresql.ARRAY(sa.String()),
+        nullable=False,
+        server_default=sa.text("'{}'"),
+    )
+    op.create_index(
+        "ix_articles_tag_list",
+        "articles",
+        ["tag_list"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+    op.create_table(
+        "tags",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("articles_count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index("ix_tags_articles_count", "tags", ["articles_count"], unique=False)
+    op.execute("""
+        INSERT INTO tags (name, articles_count)
+        SELECT t, count(*) FROM articles, unnest(articles.tag_list) AS t
+        GROUP BY t
+        """)
+
+    # Счётчики тегов поддерживаются триггерами, в том числе при каскадном
+    # удалении статей вместе с автором. Триггеры уровня оператора: изменения
+    # всех строк (например, пачки импорта) сводятся в одну разницу по тегам,
+    # и строки tags блокируются в порядке имени. Поэтому параллельные записи
+    # статей с общими тегами не блокируют друг друга взаимно.
+    op.execute("""
+        CREATE FUNCTION articles_update_tag_counts() RETURNS trigger AS $$
+        DECLARE
+            names varchar[];
+            deltas integer[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(t ORDER BY t), array_agg(n ORDER BY t)
+                INTO names, deltas
+                FROM (
+                    SELECT t, count(DISTINCT id)::integer AS n
+                    FROM new_rows, unnest(new_rows.tag_list) AS t
+                    GROUP BY t
+                ) AS changes;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(t ORDER BY t), array_agg(n ORDER BY t)
+                INTO names, deltas
+                FROM (
+                    SELECT t, -count(DISTINCT id)::integer AS n
+                    FROM old_rows, unnest(old_rows.tag_list) AS t
+                    GROUP BY t
+                ) AS changes;
+            ELSE
+                SELECT array_agg(t ORDER BY t), array_agg(n ORDER BY t)
+                INTO names, deltas
+                FROM (
+                    SELECT t, sum(d)::integer AS n
+                    FROM (
+                        SELECT DISTINCT id, t, 1 AS d
+                        FROM new_rows, unnest(new_rows.tag_list) AS t
+                        UNION ALL
+                        SELECT DISTINCT id, t, -1 AS d
+                        FROM old_rows, unnest(old_rows.tag_list) AS t
+                    ) AS tagged
+                    GROUP BY t
+                    HAVING sum(d) <> 0
+                ) AS changes;
+            END IF;
+            IF names IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            INSERT INTO tags (name, articles_count)
+            SELECT name, n FROM unnest(names, deltas) AS d(name, n)
+            ORDER BY name
+            ON CONFLICT (name)
+            DO UPDATE SET articles_count = tags.articles_count + EXCLUDED.articles_count;
+            DELETE FROM tags WHERE name = ANY(names) AND articles_count <= 0;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """)
+    op.execute("""
+        CREATE TRIGGER articles_tag_counts_insert
+        AFTER INSERT ON articles
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION articles_update_tag_counts()
+        """)
+    op.execute("""
+        CREATE TRIGGER articles_tag_counts_update
+        AFTER UPDATE ON articles
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION articles_update_tag_counts()
+        """)
+    op.execute("""
+        CREATE TRIGGER articles_tag_counts_delete
+        AFTER DELETE ON articles
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION articles_update_tag_counts()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER articles_tag_counts_delete ON articles")
+    op.execute("DROP TRIGGER articles_tag_counts_update ON articles")
+    op.execute("DROP TRIGGER articles_tag_counts_insert ON articles")
+    op.execute("DROP FUNCTION articles_update_tag_counts()")
+    op.drop_index("ix_tags_articles_count", table_name="tags")
+    op.drop_table("tags")
+    op.drop_index("ix_articles_tag_list", table_name="articles")
+    op.alter_column(
+        "articles",
+        "tag_list",
+        existing_type=postgresql.ARRAY(sa.String()),
+        nullable=True,
+        server_default=None,
+    )
+    op.alter_column(
+        "articles",
+        "tag_list",
+        type_=sa.String(length=500),
+        existing_type=postgresql.ARRAY(sa.String()),
+        postgresql_using="nullif(array_to_string(tag_list, ','), '')",
+    )
@@ -0,0 +1,53 @@
+"""Article full-text search vector
+
+Revision ID: d2e8f04a6c17
+Revises: c47a1d9e5b13
+Create Date: 2026-10-18 14:21:37.640115
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2e8f04a6c17"
+down_revision: Union[str, Sequence[str], None] = "c47a1d9e5b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Вычисляемая колонка пересчитывается Postgres при каждой записи;
+    # добавление переписывает таблицу и заполняет вектор для всех статей
+    op.add_column(
+        "articles",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+                "setweight(to_tsvector('russian', coalesce(body, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_articles_search_vector",
+        "articles",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.drop_column("articles", "search_vector")
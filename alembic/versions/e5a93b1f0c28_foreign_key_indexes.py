@@ -0,0 +1,105 @@
+"""Foreign key indexes, drop redundant primary key indexes
+
+Revision ID: e5a93b1f0c28
+Revises: d2e8f04a6c17
+Create Date: 2026-10-18 15:02:18.227461
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a93b1f0c28"
+down_revision: Union[str, Sequence[str], None] = "d2e8f04a6c17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Индекс comments (article_id, created_at, id) уже создан в 3b9e4d2a7c51
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись, но не работает внутри транзакции.
+    # Если построение прервётся, останется INVALID-индекс: его нужно удалить
+    # вручную и повторить миграцию
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_articles_author_id_created_at_id",
+            "articles",
+            ["author_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_comments_author_id_created_at_id",
+            "comments",
+            ["author_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Первичные ключи уже проиндексированы своими ограничениями
+        op.drop_index(
+            "ix_users_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_articles_id",
+            table_name="articles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_comments_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_id",
+            "comments",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_articles_id",
+            "articles",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_users_id",
+            "users",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_comments_author_id_created_at_id",
+            table_name="comments",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_articles_author_id_created_at_id",
+            table_name="articles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,91 @@
+"""Сравнение полного и краткого (fields=summary) списка статей.
+
+Запускается против БД из настроек приложения, в которой уже есть статьи:
+
+    python -m benchmarks.article_listing --requests 500 --limit 20
+
+Для каждого режима выводит объём данных, прочитанных из Postgres
+(суммарная длина строк страницы в текстовом виде), размер HTTP-ответа и
+p50/p99 латентности обработки запроса приложением.
+"""
+
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+
+import httpx
+from sqlalchemy import select, text
+
+from src.core.database import AsyncSessionLocal, engine
+from src.main import app
+from src.models.article import Article
+from src.repositories.article import ArticleRepository
+
+
+def percentile(samples: list, q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def db_bytes(columns, limit: int) -> int:
+    """Объём строк одной страницы (без учёта сжатия TOAST)"""
+    page = (
+        select(*columns)
+        .order_by(Article.created_at.desc(), Article.id.desc())
+        .limit(limit)
+        .subquery("page")
+    )
+    stmt = select(text("coalesce(sum(octet_length(page::text)), 0)")).select_from(page)
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(stmt)).scalar_one()
+
+
+async def measure(client: httpx.AsyncClient, params: dict, requests: int) -> dict:
+    latencies = []
+    response_bytes = 0
+    for _ in range(requests):
+        started = perf_counter()
+        response = await client.get("/api/articles/", params=params)
+        latencies.append((perf_counter() - started) * 1000)
+        response.raise_for_status()
+        response_bytes = len(response.content)
+    return {
+        "response_bytes": response_bytes,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def main(requests: int, limit: int) -> None:
+    modes = {
+        "full": ([Article], {"limit": limit}),
+        "summary": (
+            ArticleRepository.summary_columns,
+            {"limit": limit, "fields": "summary"},
+        ),
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for name, (columns, params) in modes.items():
+            # Прогрев пула соединений и кешей
+            await measure(client, params, 10)
+            result = await measure(client, params, requests)
+            result["db_bytes"] = await db_bytes(columns, limit)
+            print(
+                f"{name:8} db={result['db_bytes']:>10} B  "
+                f"response={result['response_bytes']:>10} B  "
+                f"p50={result['p50_ms']:.2f} ms  p99={result['p99_ms']:.2f} ms"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.limit))
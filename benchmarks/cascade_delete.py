@@ -0,0 +1,106 @@
+"""Удаление статьи с большим числом комментариев.
+
+Создаёт пользователя и статью со 100 000 комментариев, удаляет статью через
+ArticleController и проверяет, что пик памяти Python не зависит от числа
+комментариев (каскад выполняет Postgres):
+
+    python -m benchmarks.cascade_delete --comments 100000 --max-peak-mb 5
+"""
+
+import argparse
+import asyncio
+import sys
+import tracemalloc
+import uuid
+from time import perf_counter
+
+from sqlalchemy import func, insert, select
+
+from src.controllers.article import ArticleController
+from src.core.database import AsyncSessionLocal, engine
+from src.models.article import Article
+from src.models.comment import Comment
+from src.models.user import User
+
+CHUNK_SIZE = 5000
+
+
+async def seed(comments: int) -> tuple:
+    suffix = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as session:
+        user_id = (
+            await session.execute(
+                insert(User)
+                .values(
+                    username=f"cascade-{suffix}",
+                    email=f"cascade-{suffix}@example.com",
+                    hashed_password="-",
+                )
+                .returning(User.id)
+            )
+        ).scalar_one()
+        article_id = (
+            await session.execute(
+                insert(Article)
+                .values(
+                    slug=f"cascade-{suffix}",
+                    title="Cascade",
+                    description="Cascade delete benchmark",
+                    body="-",
+                    author_id=user_id,
+                )
+                .returning(Article.id)
+            )
+        ).scalar_one()
+        for start in range(0, comments, CHUNK_SIZE):
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "body": f"comment {n}",
+                    "article_id": article_id,
+                    "author_id": user_id,
+                }
+                for n in range(start, min(start + CHUNK_SIZE, comments))
+            ]
+            await session.execute(insert(Comment), rows)
+        await session.commit()
+    return user_id, f"cascade-{suffix}", article_id
+
+
+async def main(comments: int, max_peak_mb: float) -> int:
+    user_id, slug, article_id = await seed(comments)
+
+    async with AsyncSessionLocal() as session:
+        tracemalloc.start()
+        started = perf_counter()
+        await ArticleController(session).delete_article(slug, user_id)
+        elapsed = perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        remaining = (
+            await session.execute(
+                select(func.count()).where(Comment.article_id == article_id)
+            )
+        ).scalar_one()
+        await session.delete(await session.get(User, user_id))
+        await session.commit()
+    await engine.dispose()
+
+    peak_mb = peak / 1024 / 1024
+    print(
+        f"comments={comments} elapsed={elapsed:.2f}s "
+        f"peak={peak_mb:.2f} MB remaining={remaining}"
+    )
+    if remaining or peak_mb > max_peak_mb:
+        print("FAIL: cascade delete is not bounded", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--max-peak-mb", type=float, default=5.0)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.comments, args.max_peak_mb)))
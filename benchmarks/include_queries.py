@@ -0,0 +1,147 @@
+"""Число SQL-запросов для include=author не зависит от размера страницы.
+
+Создаёт статьи и комментарии разных авторов (каждый элемент страницы —
+свой автор) и запрашивает списки с `include=author` при разных `limit`
+через приложение in-process:
+
+    python -m benchmarks.include_queries --sizes 1 10 50
+
+Код возврата ненулевой, если число запросов у эндпоинта меняется вместе
+с размером страницы. Созданные данные в конце удаляются.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import delete, event, insert
+
+from src.core.database import AsyncSessionLocal, engine
+from src.main import app
+from src.models.article import Article
+from src.models.comment import Comment
+from src.models.user import User
+
+
+class Counter:
+    statements = 0
+
+
+counter = Counter()
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    counter.statements += 1
+
+
+async def seed(suffix: str, count: int) -> Dict[str, object]:
+    """count авторов, у каждого статья и комментарий к первой статье"""
+    async with AsyncSessionLocal() as session:
+        user_ids = (
+            await session.scalars(
+                insert(User).returning(User.id),
+                [
+                    {
+                        "username": f"include-{suffix}-{n}",
+                        "email": f"include-{suffix}-{n}@example.com",
+                        "hashed_password": "-",
+                    }
+                    for n in range(count)
+                ],
+            )
+        ).all()
+        articles = (
+            await session.execute(
+                insert(Article).returning(Article.id, Article.slug),
+                [
+                    {
+                        "slug": f"include-{suffix}-{n}",
+                        "title": f"Include {n}",
+                        "description": "include=author check",
+                        "body": "-",
+                        "tag_list": [f"include-{suffix}"],
+                        "author_id": user_id,
+                    }
+                    for n, user_id in enumerate(user_ids)
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(Comment),
+            [
+                {"body": "-", "article_id": articles[0].id, "author_id": user_id}
+                for user_id in user_ids
+            ],
+        )
+        await session.commit()
+    return {
+        "user_ids": list(user_ids),
+        "slug": articles[0].slug,
+        "tag": f"include-{suffix}",
+    }
+
+
+async def cleanup(user_ids: List[uuid.UUID]) -> None:
+    async with AsyncSessionLocal() as session:
+        # Статьи и комментарии удаляются каскадом
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def count_statements(client: httpx.AsyncClient, url: str, size: int) -> int:
+    counter.statements = 0
+    response = await client.get(url)
+    response.raise_for_status()
+    body = response.json()
+    items = body["items"] if isinstance(body, dict) else body
+    if len(items) != size or any(item["author"] is None for item in items):
+        raise RuntimeError(f"{url}: expected {size} items with authors")
+    return counter.statements
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    data = await seed(uuid.uuid4().hex[:8], max(args.sizes))
+    slug, tag = data["slug"], data["tag"]
+    endpoints = {
+        "articles": f"/api/articles/?include=author&tag={tag}",
+        "articles summary": f"/api/articles/?include=author&fields=summary&tag={tag}",
+        "articles cursor": f"/api/articles/?include=author&pagination=cursor&tag={tag}",
+        "comments": f"/api/articles/{slug}/comments?include=author",
+        "comments cursor": (
+            f"/api/articles/{slug}/comments?include=author&pagination=cursor"
+        ),
+    }
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for name, url in endpoints.items():
+                counts = [
+                    await count_statements(client, f"{url}&limit={size}", size)
+                    for size in args.sizes
+                ]
+                ok = len(set(counts)) == 1
+                failures += not ok
+                sizes = " ".join(
+                    f"limit={size}:{count}" for size, count in zip(args.sizes, counts)
+                )
+                print(f"{name:18} {sizes:40} {'ok' if ok else 'FAIL'}")
+    finally:
+        await cleanup(data["user_ids"])
+        await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,378 @@
+"""Нагрузочные сценарии API с машиночитаемым результатом.
+
+Запускается против БД, заполненной benchmarks.seed. По умолчанию
+приложение вызывается in-process, с --url — по сети (uvicorn, прокси):
+
+    python -m benchmarks.load --duration 30 --concurrency 20 --output run.json
+    python -m benchmarks.load --url http://localhost:8000 --baseline base.json
+
+Сценарии выполняются по очереди, каждый --duration секунд в --concurrency
+параллельных клиентов:
+
+- auth — регистрация нового пользователя и логин;
+- feed — листание ленты (`fields=summary`, курсорная пагинация)
+  на --feed-pages страниц вглубь;
+- article — чтение случайных статей из ленты;
+- comments — пачка из --burst одновременных комментариев к одной статье
+  и чтение её комментариев.
+
+Для каждого сценария считаются RPS, p50/p95/p99 латентности и среднее
+число SQL-запросов на HTTP-запрос (из заголовка Server-Timing, нужен
+INSTRUMENTATION_ENABLED). С --baseline результат сравнивается с
+сохранённым прогоном: падение RPS или рост p95 больше --tolerance
+процентов и рост числа запросов считаются регрессией, код возврата
+ненулевой. Созданные пользователи и комментарии в конце удаляются.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from sqlalchemy import delete
+
+from benchmarks.article_listing import percentile
+from src.core.database import AsyncSessionLocal, engine
+from src.main import app
+from src.models.user import User
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# Поля результата сценария и направление «лучше»
+HIGHER_IS_BETTER = ("rps",)
+LOWER_IS_BETTER = ("p95_ms",)
+
+
+@dataclass
+class ScenarioStats:
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+    seconds: float = 0.0
+
+    def result(self) -> dict:
+        requests = len(self.latencies)
+        return {
+            "requests": requests,
+            "errors": self.errors,
+            "rps": round(requests / self.seconds, 1) if self.seconds else 0.0,
+            "p50_ms": round(percentile(self.latencies, 50), 2) if requests else None,
+            "p95_ms": round(percentile(self.latencies, 95), 2) if requests else None,
+            "p99_ms": round(percentile(self.latencies, 99), 2) if requests else None,
+            "queries_per_request": (
+                round(statistics.mean(self.queries), 2) if self.queries else None
+            ),
+        }
+
+
+class LoadClient:
+    """HTTP-клиент, записывающий латентность и число SQL-запросов"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: ScenarioStats):
+        self.client = client
+        self.stats = stats
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        started = perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.stats.errors += 1
+            raise
+        self.stats.latencies.append((perf_counter() - started) * 1000)
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+        if match:
+            self.stats.queries.append(int(match.group(1)))
+        if response.status_code >= 400:
+            self.stats.errors += 1
+        return response
+
+
+@dataclass
+class Context:
+    """Данные, подготовленные до начала замеров"""
+
+    prefix: str
+    password: str
+    token: str
+    slugs: List[str]
+    feed_pages: int
+    burst: int
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+async def register(client: LoadClient, ctx: Context) -> httpx.Response:
+    name = f"{ctx.prefix}-{uuid.uuid4().hex[:12]}"
+    return await client.request(
+        "POST",
+        "/api/users/",
+        json={
+            "username": name,
+            "email": f"{name}@example.com",
+            "password": ctx.password,
+        },
+    )
+
+
+async def auth(client: LoadClient, ctx: Context, rng: random.Random) -> None:
+    response = await register(client, ctx)
+    if response.status_code == 201:
+        await client.request(
+            "POST",
+            "/api/users/login",
+            json={"email": response.json()["email"], "password": ctx.password},
+        )
+
+
+async def feed(client: LoadClient, ctx: Context, rng: random.Random) -> None:
+    params = {"fields": "summary", "pagination": "cursor", "limit": 20}
+    for _ in range(ctx.feed_pages):
+        response = await client.request("GET", "/api/articles/", params=params)
+        if response.status_code != 200:
+            return
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return
+        params["cursor"] = cursor
+
+
+async def article(client: LoadClient, ctx: Context, rng: random.Random) -> None:
+    await client.request("GET", f"/api/articles/{rng.choice(ctx.slugs)}")
+
+
+async def comments(client: LoadClient, ctx: Context, rng: random.Random) -> None:
+    url = f"/api/articles/{rng.choice(ctx.slugs)}/comments"
+    await asyncio.gather(
+        *(
+            client.request(
+                "POST",
+                url,
+                json={"body": f"Комментарий под нагрузкой {n}"},
+                headers=ctx.auth_headers,
+            )
+            for n in range(ctx.burst)
+        ),
+        return_exceptions=True,
+    )
+    await client.request("GET", url, params={"pagination": "cursor"})
+
+
+Scenario = Callable[[LoadClient, Context, random.Random], Awaitable[None]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "auth": auth,
+    "feed": feed,
+    "article": article,
+    "comments": comments,
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: Context,
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> dict:
+    stats = ScenarioStats()
+    deadline = perf_counter() + duration
+
+    async def worker(n: int) -> None:
+        rng = random.Random(seed * 1000 + n)
+        load_client = LoadClient(client, stats)
+        while perf_counter() < deadline:
+            try:
+                await scenario(load_client, ctx, rng)
+            except httpx.HTTPError:
+                pass
+
+    started = perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    stats.seconds = perf_counter() - started
+    return stats.result()
+
+
+async def prepare(client: httpx.AsyncClient, args: argparse.Namespace) -> Context:
+    """Пользователь для комментариев и slug статей из ленты"""
+    ctx = Context(
+        prefix=args.prefix,
+        password="load-password",
+        token="",
+        slugs=[],
+        feed_pages=args.feed_pages,
+        burst=args.burst,
+    )
+    response = await register(LoadClient(client, ScenarioStats()), ctx)
+    response.raise_for_status()
+    login = await client.post(
+        "/api/users/login",
+        json={"email": response.json()["email"], "password": ctx.password},
+    )
+    login.raise_for_status()
+    ctx.token = login.json()["access_token"]
+
+    params = {"fields": "summary", "pagination": "cursor", "limit": 100}
+    while len(ctx.slugs) < args.articles:
+        page = await client.get("/api/articles/", params=params)
+        page.raise_for_status()
+        body = page.json()
+        ctx.slugs.extend(item["slug"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    if not ctx.slugs:
+        raise SystemExit("В БД нет статей, сначала запустите benchmarks.seed")
+    return ctx
+
+
+async def cleanup(prefix: str) -> None:
+    async with AsyncSessionLocal() as session:
+        # Комментарии пользователей удаляются каскадом
+        await session.execute(delete(User).where(User.username.startswith(prefix)))
+        await session.commit()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Регрессии текущего прогона относительно baseline"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        for key in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            old, new = base.get(key), result.get(key)
+            if not old or new is None:
+                continue
+            change = (new / old - 1) * 100
+            if key in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{name}: {key} {old} -> {new} ({change:+.1f}%)")
+        old, new = base.get("queries_per_request"), result.get("queries_per_request")
+        if old is not None and new is not None and new > old:
+            regressions.append(f"{name}: queries_per_request {old} -> {new}")
+    return regressions
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    print(
+        f"{'scenario':10} {'requests':>9} {'errors':>7} {'rps':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}"
+    )
+    for name, r in results.items():
+        queries = r["queries_per_request"]
+        print(
+            f"{name:10} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9} "
+            f"{r['p50_ms'] or '-':>8} {r['p95_ms'] or '-':>8} "
+            f"{r['p99_ms'] or '-':>8} {queries if queries is not None else '-':>8}"
+        )
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://bench",
+            timeout=args.timeout,
+        )
+
+    results: Dict[str, dict] = {}
+    try:
+        async with client:
+            ctx = await prepare(client, args)
+            for name in args.scenarios:
+                results[name] = await run_scenario(
+                    client,
+                    SCENARIOS[name],
+                    ctx,
+                    args.concurrency,
+                    args.duration,
+                    args.seed,
+                )
+                print_table({name: results[name]})
+    finally:
+        await cleanup(args.prefix)
+        await engine.dispose()
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": args.url or "in-process",
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "feed_pages": args.feed_pages,
+            "burst": args.burst,
+        },
+        "scenarios": results,
+    }
+    print()
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="адрес сервера; по умолчанию in-process")
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="секунд")
+    parser.add_argument("--feed-pages", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument(
+        "--articles", type=int, default=1000, help="сколько slug взять из ленты"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--prefix", default=f"load-{uuid.uuid4().hex[:8]}")
+    parser.add_argument("--output", help="файл для JSON-результата")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона")
+    parser.add_argument(
+        "--tolerance", type=float, default=10.0, help="допустимое ухудшение, %%"
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
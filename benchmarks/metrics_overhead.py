@@ -0,0 +1,122 @@
+"""Накладные расходы MetricsMiddleware на пропускную способность.
+
+Собирает два одинаковых приложения без БД — с MetricsMiddleware и без —
+и вызывает их напрямую через ASGI. Эндпоинт отдаёт страницу из --items
+кратких статей, как `GET /api/articles/?fields=summary`, но без запроса
+к БД, поэтому доля метрик здесь выше, чем в работающем сервисе. Кроме
+доли печатается добавленное время на запрос в микросекундах:
+
+    python -m benchmarks.metrics_overhead --requests 20000 --items 20
+
+Режимы чередуются пачками по --batch запросов, чтобы фоновые колебания
+нагрузки делились между ними поровну; сравнивается суммарное процессорное
+время каждого режима. Код возврата ненулевой, если накладные расходы
+выше --max-overhead процентов.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timezone
+from time import process_time
+
+from fastapi import FastAPI
+
+from src.core.metrics import MetricsMiddleware
+from src.schemas.article import ArticleSummaryResponse
+from src.schemas.pagination import Page
+
+
+def make_app(with_metrics: bool, items: int) -> FastAPI:
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "slug": f"article-{n}",
+            "title": f"Статья номер {n}",
+            "description": "Краткое описание статьи для списка",
+            "tag_list": ["python", "fastapi"],
+            "author_id": uuid.uuid4(),
+            "created_at": now,
+            "updated_at": None,
+        }
+        for n in range(items)
+    ]
+    app = FastAPI()
+
+    @app.get("/api/articles/", response_model=Page[ArticleSummaryResponse])
+    async def articles(tag: str):
+        return Page[ArticleSummaryResponse](
+            items=[ArticleSummaryResponse(**row) for row in rows], next_cursor=tag
+        )
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app: FastAPI, query: bytes) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/articles/",
+        "raw_path": b"/api/articles/",
+        "query_string": query,
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int, offset: int = 0) -> float:
+    """Процессорное время на requests запросов"""
+    started = process_time()
+    for n in range(offset, offset + requests):
+        await call(app, b"tag=t%d" % (n % 100))
+    return process_time() - started
+
+
+async def main(requests: int, items: int, batch: int, max_overhead: float) -> int:
+    apps = {"plain": make_app(False, items), "metrics": make_app(True, items)}
+    for app in apps.values():
+        await measure(app, min(requests, 1000))
+
+    spent = dict.fromkeys(apps, 0.0)
+    for offset in range(0, requests, batch):
+        for name, app in apps.items():
+            spent[name] += await measure(app, batch, offset)
+
+    rps = {name: requests / seconds for name, seconds in spent.items()}
+    overhead = (spent["metrics"] / spent["plain"] - 1) * 100
+    added_us = (spent["metrics"] - spent["plain"]) / requests * 1e6
+    print(
+        f"items={items} plain={rps['plain']:8.1f} req/s  "
+        f"metrics={rps['metrics']:8.1f} req/s  "
+        f"overhead={overhead:.2f}% ({added_us:.1f} us/request)"
+    )
+    return 1 if overhead > max_overhead else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--max-overhead", type=float, default=2.0, help="в процентах")
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(main(args.requests, args.items, args.batch, args.max_overhead))
+    )
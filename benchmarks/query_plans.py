@@ -0,0 +1,198 @@
+"""Регрессионная проверка планов запросов.
+
+Выполняет основные запросы репозиториев на живой базе, перехватывает
+отправленный в Postgres SQL и прогоняет его через EXPLAIN. Каждый путь
+доступа должен читаться индексным сканированием нужного индекса без
+отдельной сортировки:
+
+    python -m benchmarks.query_plans
+
+Тестовые данные создаются в транзакции, которая в конце откатывается.
+Код возврата ненулевой, если хотя бы один план не совпал с ожидаемым.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import AsyncSessionLocal, engine
+from src.models.article import Article
+from src.models.comment import Comment
+from src.models.user import User
+from src.repositories.article import ArticleRepository
+from src.repositories.comment import CommentRepository
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+@dataclass
+class Captured:
+    statements: List[tuple] = field(default_factory=list)
+
+
+captured = Captured()
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    captured.statements.append((statement, parameters))
+
+
+@dataclass
+class Case:
+    name: str
+    index: str
+    run: Callable[[AsyncSession, dict], Awaitable]
+    # Сортировка должна браться из индекса
+    allow_sort: bool = False
+
+
+def walk(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk(child)
+
+
+async def explain(session: AsyncSession, case: Case, ids: dict) -> Optional[str]:
+    """Вернуть описание ошибки или None, если план ожидаемый"""
+    captured.statements.clear()
+    await case.run(session, ids)
+    if len(captured.statements) != 1:
+        return f"expected 1 statement, got {len(captured.statements)}"
+    statement, parameters = captured.statements[0]
+    captured.statements.clear()
+
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + statement, parameters
+    )
+    raw = result.scalar_one()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    nodes = list(walk(plan))
+
+    used = {
+        node.get("Index Name") for node in nodes if node["Node Type"] in INDEX_SCANS
+    }
+    if case.index not in used:
+        return f"index {case.index} not used (scans: {sorted(filter(None, used))})"
+    if not case.allow_sort and any(node["Node Type"] == "Sort" for node in nodes):
+        return "plan contains an explicit Sort"
+    return None
+
+
+async def seed(session: AsyncSession) -> dict:
+    suffix = uuid.uuid4().hex[:8]
+    user_id = (
+        await session.execute(
+            insert(User)
+            .values(
+                username=f"plans-{suffix}",
+                email=f"plans-{suffix}@example.com",
+                hashed_password="-",
+            )
+            .returning(User.id)
+        )
+    ).scalar_one()
+    article_id = (
+        await session.execute(
+            insert(Article)
+            .values(
+                slug=f"plans-{suffix}",
+                title="Plans",
+                description="Query plan check",
+                body="-",
+                author_id=user_id,
+            )
+            .returning(Article.id)
+        )
+    ).scalar_one()
+    comment_id = (
+        await session.execute(
+            insert(Comment)
+            .values(body="-", article_id=article_id, author_id=user_id)
+            .returning(Comment.id)
+        )
+    ).scalar_one()
+    return {
+        "user": user_id,
+        "article": article_id,
+        "slug": f"plans-{suffix}",
+        "comment": comment_id,
+    }
+
+
+AFTER = (datetime.now(timezone.utc), uuid.UUID(int=0))
+
+CASES = [
+    Case(
+        "comments by article",
+        "ix_comments_article_id_created_at_id",
+        lambda db, ids: CommentRepository(db).get_page_by_article_slug(
+            ids["slug"], AFTER, limit=20
+        ),
+        # Сортируются не больше limit строк, уже прочитанных по индексу
+        allow_sort=True,
+    ),
+    Case(
+        "comments by author",
+        "ix_comments_author_id_created_at_id",
+        lambda db, ids: db.execute(
+            select(Comment)
+            .where(Comment.author_id == ids["user"])
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
+            .limit(20)
+        ),
+    ),
+    Case(
+        "articles by author",
+        "ix_articles_author_id_created_at_id",
+        lambda db, ids: ArticleRepository(db).get_by_author_id(ids["user"], limit=20),
+    ),
+    Case(
+        "articles page",
+        "ix_articles_created_at_id",
+        lambda db, ids: ArticleRepository(db).get_page(AFTER, limit=20),
+    ),
+    Case(
+        "article by id",
+        "articles_pkey",
+        lambda db, ids: ArticleRepository(db).get(ids["article"]),
+    ),
+    Case(
+        "comment by article and id",
+        "comments_pkey",
+        lambda db, ids: CommentRepository(db).get_author_by_article_slug(
+            ids["slug"], ids["comment"]
+        ),
+    ),
+]
+
+
+async def main() -> int:
+    failures = 0
+    async with AsyncSessionLocal() as session:
+        ids = await seed(session)
+        # На почти пустых таблицах планировщик всегда выбрал бы seq scan
+        conn = await session.connection()
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+        for case in CASES:
+            error = await explain(session, case, ids)
+            status = "ok" if error is None else f"FAIL: {error}"
+            print(f"{case.name:28} {case.index:40} {status}")
+            failures += error is not None
+
+        await session.rollback()
+    await engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
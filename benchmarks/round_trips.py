@@ -0,0 +1,120 @@
+"""Количество обращений к Postgres на каждый эндпоинт.
+
+Проходит по типичному сценарию (регистрация, логин, статьи, комментарии)
+через приложение in-process и печатает, сколько SQL-запросов и служебных
+BEGIN/COMMIT/ROLLBACK понадобилось каждому вызову:
+
+    python -m benchmarks.round_trips
+
+Для сравнения запустите скрипт на двух ревизиях.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+import httpx
+from sqlalchemy import event
+
+from src.core.database import engine
+from src.main import app
+
+
+@dataclass
+class RoundTrips:
+    statements: int = 0
+    transactions: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.statements + self.transactions
+
+
+counter = RoundTrips()
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter.statements += 1
+
+
+@event.listens_for(engine.sync_engine, "begin")
+@event.listens_for(engine.sync_engine, "commit")
+@event.listens_for(engine.sync_engine, "rollback")
+def _count_transaction(conn):
+    counter.transactions += 1
+
+
+async def call(client: httpx.AsyncClient, name: str, method: str, url: str, **kw):
+    counter.statements = counter.transactions = 0
+    response = await client.request(method, url, **kw)
+    response.raise_for_status()
+    print(
+        f"{name:24} {response.status_code}  statements={counter.statements:<3} "
+        f"begin/commit/rollback={counter.transactions:<3} total={counter.total}"
+    )
+    return response
+
+
+async def main() -> None:
+    suffix = uuid.uuid4().hex[:8]
+    credentials = {"email": f"bench-{suffix}@example.com", "password": "password"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await call(
+            client,
+            "register",
+            "POST",
+            "/api/users/",
+            json={**credentials, "username": f"bench-{suffix}"},
+        )
+        login = await call(
+            client, "login", "POST", "/api/users/login", json=credentials
+        )
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        await call(client, "get me (cold)", "GET", "/api/users/me")
+        await call(client, "get me (warm)", "GET", "/api/users/me")
+        await call(client, "update me", "PUT", "/api/users/me", json={"bio": "bench"})
+
+        article = await call(
+            client,
+            "create article",
+            "POST",
+            "/api/articles/",
+            json={"title": "Bench", "description": "d", "body": "b", "tag_list": ["x"]},
+        )
+        slug = article.json()["slug"]
+        await call(client, "get article", "GET", f"/api/articles/{slug}")
+        await call(client, "list articles", "GET", "/api/articles/")
+        article = await call(
+            client,
+            "update article",
+            "PUT",
+            f"/api/articles/{slug}",
+            json={"title": f"Bench {suffix}"},
+        )
+        slug = article.json()["slug"]
+
+        comment = await call(
+            client,
+            "create comment",
+            "POST",
+            f"/api/articles/{slug}/comments",
+            json={"body": "bench"},
+        )
+        await call(client, "list comments", "GET", f"/api/articles/{slug}/comments")
+        await call(
+            client,
+            "delete comment",
+            "DELETE",
+            f"/api/articles/{slug}/comments/{comment.json()['id']}",
+        )
+        await call(client, "delete article", "DELETE", f"/api/articles/{slug}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,234 @@
+"""Генератор синтетических данных для нагрузочных тестов.
+
+Заполняет БД из настроек приложения пользователями, статьями и
+комментариями через COPY (asyncpg copy_records_to_table):
+
+    python -m benchmarks.seed --users 10000 --articles 100000 --comments 1000000
+
+Данные воспроизводимы: при одинаковых --seed и размерах генерируются
+одни и те же строки (даты отсчитываются от момента запуска). Повторный
+запуск в ту же БД требует другого --prefix: username, email и slug
+уникальны. Распределения неравномерные, как в живом блоге:
+у небольшой части авторов большинство статей, у популярных статей
+большинство комментариев. Все пользователи получают пароль --password,
+их email — `<prefix>-user-<n>@example.com`.
+
+Строки статей проходят через триггер счётчиков тегов, search_vector
+вычисляется Postgres. После загрузки выполняется ANALYZE.
+"""
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from typing import Iterator, List, Sequence
+
+from src.core.database import engine
+from src.core.security import security_service
+
+WORDS = (
+    "асинхронный python база данных индекс запрос сервер клиент кеш очередь "
+    "поток событие транзакция схема миграция репозиторий контроллер маршрут "
+    "ответ статья комментарий автор тег поиск страница курсор пагинация "
+    "производительность задержка пропускная способность нагрузка профиль "
+    "метрика журнал ошибка тест сборка развёртывание контейнер образ сеть "
+    "протокол соединение пул воркер процесс память диск план выполнение"
+).split()
+
+TAGS = (
+    "python fastapi postgres sqlalchemy asyncio docker kubernetes redis "
+    "performance testing devops linux security api design architecture "
+    "databases caching monitoring observability backend frontend javascript "
+    "typescript go rust java kotlin career tutorial news release"
+).split()
+
+# Начало интервала дат создания
+HISTORY_DAYS = 365
+
+
+def skewed(rng: random.Random, size: int, power: float) -> int:
+    """Индекс в [0, size): чем больше power, тем чаще малые индексы"""
+    return min(size - 1, int(size * rng.random() ** power))
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng, rng.randint(6, 16)) for _ in range(rng.randint(3, 8)))
+
+
+def timestamp(rng: random.Random, now: datetime) -> datetime:
+    return now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))
+
+
+def new_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def users(
+    rng: random.Random, count: int, prefix: str, hashed_password: str, now: datetime
+) -> Iterator[tuple]:
+    for n in range(count):
+        yield (
+            new_uuid(rng),
+            f"{prefix}-user-{n}",
+            f"{prefix}-user-{n}@example.com",
+            hashed_password,
+            sentence(rng, rng.randint(4, 12)) if rng.random() < 0.3 else None,
+            None,
+            timestamp(rng, now),
+        )
+
+
+def articles(
+    rng: random.Random,
+    count: int,
+    prefix: str,
+    user_ids: Sequence[uuid.UUID],
+    now: datetime,
+) -> Iterator[tuple]:
+    for n in range(count):
+        title = sentence(rng, rng.randint(3, 8))[:-1]
+        created_at = timestamp(rng, now)
+        updated_at = (
+            created_at + timedelta(hours=rng.randint(1, 240))
+            if rng.random() < 0.1
+            else None
+        )
+        yield (
+            new_uuid(rng),
+            f"{prefix}-{n}",
+            title,
+            sentence(rng, rng.randint(8, 20)),
+            "\n\n".join(paragraph(rng) for _ in range(rng.randint(2, 12))),
+            sorted({TAGS[skewed(rng, len(TAGS), 2)] for _ in range(rng.randint(0, 4))}),
+            user_ids[skewed(rng, len(user_ids), 3)],
+            created_at,
+            updated_at,
+        )
+
+
+def comments(
+    rng: random.Random,
+    count: int,
+    article_ids: Sequence[uuid.UUID],
+    user_ids: Sequence[uuid.UUID],
+    now: datetime,
+) -> Iterator[tuple]:
+    for _ in range(count):
+        yield (
+            new_uuid(rng),
+            sentence(rng, rng.randint(3, 40)),
+            article_ids[skewed(rng, len(article_ids), 2)],
+            user_ids[skewed(rng, len(user_ids), 2)],
+            timestamp(rng, now),
+        )
+
+
+async def copy(
+    connection,
+    table: str,
+    columns: List[str],
+    rows: Iterator[tuple],
+    count: int,
+    batch: int,
+) -> None:
+    """COPY пачками по batch строк с выводом прогресса"""
+    started = perf_counter()
+    done = 0
+    while done < count:
+        size = min(batch, count - done)
+        chunk = [next(rows) for _ in range(size)]
+        await connection.copy_records_to_table(table, records=chunk, columns=columns)
+        done += size
+        elapsed = perf_counter() - started
+        print(f"\r{table:9} {done:>10}/{count}  {done / elapsed:9.0f} rows/s", end="")
+    print()
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    hashed_password = security_service.hash_password(args.password)
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        pg = raw.driver_connection
+
+        user_rows = list(users(rng, args.users, args.prefix, hashed_password, now))
+        user_ids = [row[0] for row in user_rows]
+        await copy(
+            pg,
+            "users",
+            [
+                "id",
+                "username",
+                "email",
+                "hashed_password",
+                "bio",
+                "image_url",
+                "created_at",
+            ],
+            iter(user_rows),
+            args.users,
+            args.batch,
+        )
+        del user_rows
+
+        article_ids: List[uuid.UUID] = []
+
+        def remember_ids(rows: Iterator[tuple]) -> Iterator[tuple]:
+            for row in rows:
+                article_ids.append(row[0])
+                yield row
+
+        await copy(
+            pg,
+            "articles",
+            [
+                "id",
+                "slug",
+                "title",
+                "description",
+                "body",
+                "tag_list",
+                "author_id",
+                "created_at",
+                "updated_at",
+            ],
+            remember_ids(articles(rng, args.articles, args.prefix, user_ids, now)),
+            args.articles,
+            args.batch,
+        )
+        if args.comments:
+            await copy(
+                pg,
+                "comments",
+                ["id", "body", "article_id", "author_id", "created_at"],
+                comments(rng, args.comments, article_ids, user_ids, now),
+                args.comments,
+                args.batch,
+            )
+
+        await pg.execute("ANALYZE users, articles, comments")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--articles", type=int, default=100_000)
+    parser.add_argument("--comments", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000, help="строк на COPY")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--prefix", default="bench", help="префикс username и slug")
+    parser.add_argument("--password", default="password")
+    args = parser.parse_args()
+    if args.users < 1 or (args.comments and args.articles < 1):
+        parser.error("нужен хотя бы один пользователь и статья для комментариев")
+    asyncio.run(main(args))
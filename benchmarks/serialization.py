@@ -0,0 +1,130 @@
+"""Стоимость сериализации ответов: стандартный APIRoute и FastResponseRoute.
+
+Собирает отдельное приложение с одинаковыми эндпоинтами на обоих классах
+маршрутов (без БД: контроллер-заглушка строит схемы, как настоящие
+контроллеры) и вызывает его напрямую через ASGI, без сети:
+
+    python -m benchmarks.serialization --requests 2000 --items 20
+
+Выводит запросы в секунду процессорного времени (на одно ядро) и размер
+ответа для каждого режима; ответы обоих режимов сравниваются побайтно.
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from time import process_time
+from typing import List
+
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from src.core.responses import FastResponseRoute
+from src.schemas.article import ArticleResponse, ArticleSummaryResponse
+from src.schemas.pagination import Page
+
+ROUTE_CLASSES = {"default": APIRoute, "fast": FastResponseRoute}
+
+
+def make_rows(items: int) -> List[dict]:
+    now = datetime.now(timezone.utc)
+    author_id = uuid.uuid4()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "slug": f"article-{n}",
+            "title": f"Статья номер {n}",
+            "description": "Краткое описание статьи для списка",
+            "body": "Текст статьи. " * 200,
+            "tag_list": ["python", "fastapi", "postgres"],
+            "author_id": author_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for n in range(items)
+    ]
+
+
+def make_app(items: int) -> FastAPI:
+    rows = make_rows(items)
+    app = FastAPI()
+    for name, route_class in ROUTE_CLASSES.items():
+        router = APIRouter(prefix=f"/{name}", route_class=route_class)
+
+        @router.get("/full", response_model=List[ArticleResponse])
+        async def full():
+            return [ArticleResponse(**row) for row in rows]
+
+        @router.get("/summary", response_model=Page[ArticleSummaryResponse])
+        async def summary():
+            return Page[ArticleSummaryResponse](
+                items=[ArticleSummaryResponse(**row) for row in rows],
+                next_cursor="cursor",
+            )
+
+        app.include_router(router)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    for _ in range(min(requests, 50)):
+        await call(app, path)
+    started = process_time()
+    for _ in range(requests):
+        await call(app, path)
+    return requests / (process_time() - started)
+
+
+async def main(requests: int, items: int) -> None:
+    app = make_app(items)
+    for endpoint in ("full", "summary"):
+        default_body = await call(app, f"/default/{endpoint}")
+        fast_body = await call(app, f"/fast/{endpoint}")
+        assert default_body == fast_body, f"{endpoint}: responses differ"
+
+        results = {
+            name: await measure(app, f"/{name}/{endpoint}", requests)
+            for name in ROUTE_CLASSES
+        }
+        print(
+            f"{endpoint:8} items={items} bytes={len(fast_body):<7} "
+            + " ".join(f"{name}={rps:8.1f} req/s" for name, rps in results.items())
+            + f"  speedup={results['fast'] / results['default']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.items))
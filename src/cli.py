@@ -0,0 +1,127 @@
+"""Служебные команды блога.
+
+    python -m src.cli import-articles articles.ndjson --author admin@example.com
+    python -m src.cli export articles --tag python -o articles.ndjson
+
+Файл `-` — stdin или stdout. Прерванную выгрузку можно продолжить
+с --cursor последней записанной строки, дописывая в тот же файл.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Optional
+from uuid import UUID
+
+from src.controllers.article import IMPORT_MAX_CHUNK_SIZE, ArticleController
+from src.controllers.export import export_lines
+from src.core.database import AsyncSessionLocal, engine
+from src.core.ndjson import buffered, read_lines
+from src.core.pagination import CursorKey, decode_cursor
+from src.repositories.user import UserRepository
+
+READ_SIZE = 1024 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(file.read, READ_SIZE):
+        yield chunk
+
+
+async def import_articles(path: str, author_email: str, chunk_size: int) -> int:
+    async with AsyncSessionLocal() as db:
+        author = await UserRepository(db).get_by_email(author_email)
+        if not author:
+            print(f"Пользователь {author_email} не найден", file=sys.stderr)
+            return 1
+
+        file = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            report = await ArticleController(db).import_articles(
+                read_lines(read_chunks(file)), author.id, chunk_size
+            )
+        finally:
+            if file is not sys.stdin.buffer:
+                file.close()
+    await engine.dispose()
+
+    for error in report.errors:
+        print(f"line {error.line}: {error.error}", file=sys.stderr)
+    if report.errors_truncated:
+        print("...", file=sys.stderr)
+    print(
+        f"imported={report.imported} failed={report.failed} "
+        f"elapsed={report.elapsed_seconds:.1f}s "
+        f"rate={report.rows_per_second:.0f} rows/s"
+    )
+    return 0 if not report.failed else 2
+
+
+async def export(args: argparse.Namespace, after: Optional[CursorKey]) -> int:
+    lines = export_lines(
+        args.resource,
+        after,
+        args.author_id,
+        args.tag,
+        args.updated_from,
+        args.updated_to,
+    )
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "ab")
+    try:
+        async for chunk in buffered(lines):
+            output.write(chunk)
+    finally:
+        output.flush()
+        if output is not sys.stdout.buffer:
+            output.close()
+    await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Служебные команды блога")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser(
+        "import-articles", help="Импортировать статьи из NDJSON"
+    )
+    import_parser.add_argument("path", help="Файл NDJSON или - для stdin")
+    import_parser.add_argument(
+        "--author", required=True, help="Email автора импортируемых статей"
+    )
+    import_parser.add_argument("--chunk-size", type=int, default=1000)
+
+    export_parser = commands.add_parser(
+        "export", help="Выгрузить статьи или комментарии в NDJSON"
+    )
+    export_parser.add_argument(
+        "resource", choices=["articles", "comments"], nargs="?", default="articles"
+    )
+    export_parser.add_argument(
+        "-o", "--output", default="-", help="Файл (дописывается) или - для stdout"
+    )
+    export_parser.add_argument("--author-id", type=UUID)
+    export_parser.add_argument("--tag")
+    export_parser.add_argument("--updated-from", type=datetime.fromisoformat)
+    export_parser.add_argument("--updated-to", type=datetime.fromisoformat)
+    export_parser.add_argument("--cursor", help="Продолжить после строки с этим cursor")
+
+    args = parser.parse_args()
+    if args.command == "import-articles" and not (
+        1 <= args.chunk_size <= IMPORT_MAX_CHUNK_SIZE
+    ):
+        parser.error(f"--chunk-size должен быть от 1 до {IMPORT_MAX_CHUNK_SIZE}")
+    if args.command == "import-articles":
+        return asyncio.run(import_articles(args.path, args.author, args.chunk_size))
+    if args.command == "export":
+        try:
+            after = decode_cursor(args.cursor) if args.cursor else None
+        except ValueError:
+            parser.error("Неверный курсор")
+        return asyncio.run(export(args, after))
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
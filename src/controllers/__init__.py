@@ -1,5 +1,11 @@
 from .article import ArticleController
 from .comment import CommentController
+from .tag import TagController
 from .user import UserController
 
-__all__ = ["ArticleController", "CommentController", "UserController"]
+__all__ = [
+    "ArticleController",
+    "CommentController",
+    "TagController",
+    "UserController",
+]
@@ -1,72 +1,252 @@
+import uuid
+from datetime import datetime
+from time import perf_counter
+from typing import (AsyncIterable, AsyncIterator, Awaitable, Callable, List,
+                    Optional, Set, Tuple, Union)
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 from slugify import slugify
+from sqlalchemy import Row
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import CachedPayload, article_cache, make_etag
+from src.core.dataloader import missing_keys
+from src.core.pagination import (CursorKey, SearchCursorKey, encode_cursor,
+                                 encode_search_cursor, next_cursor)
+from src.models.article import Article
 from src.repositories.article import ArticleRepository
-from src.schemas.article import (ArticleBase, ArticleCreate, ArticleResponse,
-                                 ArticleUpdate)
+from src.repositories.base import is_unique_violation
+from src.repositories.loaders import Loaders
+from src.schemas.article import (ArticleBase, ArticleBatchRequest,
+                                 ArticleCreate, ArticleExportLine,
+                                 ArticleImportError, ArticleImportReport,
+                                 ArticleResponse, ArticleSearchHit,
+                                 ArticleSummaryResponse,
+                                 ArticleSummaryWithAuthor, ArticleUpdate,
+                                 ArticleUpdateDB, ArticleWithAuthor)
+from src.schemas.batch import Batch
+from src.schemas.pagination import Page
+
+# Сколько раз подбирать slug заново при конфликте с параллельной вставкой
+SLUG_ATTEMPTS = 5
+# Сколько ошибок по строкам возвращать в отчёте импорта
+IMPORT_MAX_ERRORS = 1000
+# Предел пачки импорта: 7 параметров на строку при лимите 32767 у Postgres
+IMPORT_MAX_CHUNK_SIZE = 4000
 
 
 class ArticleController:
     def __init__(self, db: AsyncSession):
+        self.db = db
         self.article_repo = ArticleRepository(db)
 
     async def _generate_slug(self, title: str, exclude_id: UUID = None) -> str:
-        base_slug = slugify(title)
-        slug = base_slug
-        counter = 1
-        while await self.article_repo.check_slug_exists(slug, exclude_id):
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        return slug
+        return await self.article_repo.next_free_slug(slugify(title), exclude_id)
+
+    async def _save_with_slug(
+        self,
+        title: str,
+        save: Callable[[str], Awaitable[Article]],
+        exclude_id: UUID = None,
+    ) -> Article:
+        """Сохранить статью со свободным slug, повторяя при гонке за slug"""
+        for _ in range(SLUG_ATTEMPTS):
+            slug = await self._generate_slug(title, exclude_id)
+            try:
+                return await save(slug)
+            except IntegrityError as exc:
+                if not is_unique_violation(exc, self.article_repo.slug_index):
+                    raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Не удалось подобрать уникальный slug, повторите запрос",
+        )
 
     async def create_article(self, article_in: ArticleBase, author_id: UUID):
-        slug = await self._generate_slug(article_in.title)
         article_data = article_in.model_dump()
-        article_data["slug"] = slug
         article_data["author_id"] = author_id
-        article_data["tag_list"] = (
-            ",".join(article_in.tag_list) if article_in.tag_list else None
+        article_data["tag_list"] = article_in.tag_list or []
+        article = await self._save_with_slug(
+            article_in.title,
+            lambda slug: self.article_repo.create(
+                ArticleCreate(**article_data, slug=slug)
+            ),
+        )
+        await self.db.commit()
+        return self._to_response(article)
+
+    @staticmethod
+    def _to_response(article: Article) -> ArticleResponse:
+        return ArticleResponse(
+            id=article.id,
+            title=article.title,
+            slug=article.slug,
+            description=article.description,
+            body=article.body,
+            tag_list=article.tag_list,
+            created_at=article.created_at,
+            updated_at=article.updated_at,
+            author_id=article.author_id,
+        )
+
+    @staticmethod
+    def _to_summary(row: Row) -> ArticleSummaryResponse:
+        return ArticleSummaryResponse(
+            id=row.id,
+            title=row.title,
+            slug=row.slug,
+            description=row.description,
+            tag_list=row.tag_list,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            author_id=row.author_id,
         )
-        article = await self.article_repo.create(ArticleCreate(**article_data))
-        article_resp_data = article.__dict__
-        article_resp_data["tag_list"] = (
-            article.tag_list.split(",") if article.tag_list else []
+
+    @staticmethod
+    async def _with_authors(
+        items: List, schema: type, loaders: Optional[Loaders]
+    ) -> List:
+        if loaders is None:
+            return items
+        return await loaders.with_authors(items, schema)
+
+    async def get_all_articles(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        loaders: Optional[Loaders] = None,
+    ):
+        articles = await self.article_repo.get_all(skip, limit, tag)
+        items = [self._to_response(article) for article in articles]
+        return await self._with_authors(items, ArticleWithAuthor, loaders)
+
+    async def get_articles_page(
+        self,
+        after: Optional[CursorKey] = None,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        loaders: Optional[Loaders] = None,
+    ) -> Page:
+        articles = await self.article_repo.get_page(after, limit + 1, tag)
+        items = [self._to_response(article) for article in articles[:limit]]
+        schema = ArticleResponse if loaders is None else ArticleWithAuthor
+        return Page[schema](
+            items=await self._with_authors(items, schema, loaders),
+            next_cursor=next_cursor(articles, limit),
+        )
+
+    async def get_article_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        loaders: Optional[Loaders] = None,
+    ) -> List[ArticleSummaryResponse]:
+        rows = await self.article_repo.get_summaries(skip, limit, tag)
+        items = [self._to_summary(row) for row in rows]
+        return await self._with_authors(items, ArticleSummaryWithAuthor, loaders)
+
+    async def get_article_summaries_page(
+        self,
+        after: Optional[CursorKey] = None,
+        limit: int = 20,
+        tag: Optional[str] = None,
+        loaders: Optional[Loaders] = None,
+    ) -> Page:
+        rows = await self.article_repo.get_summaries_page(after, limit + 1, tag)
+        items = [self._to_summary(row) for row in rows[:limit]]
+        schema = ArticleSummaryResponse if loaders is None else ArticleSummaryWithAuthor
+        return Page[schema](
+            items=await self._with_authors(items, schema, loaders),
+            next_cursor=next_cursor(rows, limit),
         )
-        article_response = ArticleResponse.model_validate(article_resp_data)
-        return article_response
-
-    async def get_all_articles(self, skip: int = 0, limit: int = 20):
-        articles = await self.article_repo.get_all(skip, limit)
-        return [
-            ArticleResponse(
-                id=article.id,
-                title=article.title,
-                slug=article.slug,
-                description=article.description,
-                body=article.body,
-                tag_list=article.tag_list.split(",") if article.tag_list else [],
-                created_at=article.created_at,
-                updated_at=article.updated_at,
-                author_id=article.author_id,
+
+    async def search_articles(
+        self, query: str, after: Optional[SearchCursorKey] = None, limit: int = 20
+    ) -> Page[ArticleSearchHit]:
+        rows = await self.article_repo.search(query, after, limit + 1)
+        cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            cursor = encode_search_cursor(last.rank, last.id)
+        return Page[ArticleSearchHit](
+            items=[ArticleSearchHit.model_validate(row) for row in rows[:limit]],
+            next_cursor=cursor,
+        )
+
+    async def export_articles(
+        self,
+        after: Optional[CursorKey] = None,
+        author_id: Optional[UUID] = None,
+        tag: Optional[str] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """Статьи в NDJSON: {"cursor": ..., "article": {...}} на строку
+
+        cursor строки продолжает выгрузку после неё.
+        """
+        rows = self.article_repo.stream_for_export(
+            after, author_id, tag, updated_from, updated_to
+        )
+        async for row in rows:
+            line = ArticleExportLine(
+                cursor=encode_cursor(row.created_at, row.id),
+                article=ArticleResponse.model_validate(row),
             )
-            for article in articles
-        ]
+            yield line.model_dump_json().encode() + b"\n"
 
     async def get_article_by_slug(self, slug: str):
-        article = await self.article_repo.get_by_slug(slug, load_author=True)
+        article = await self.article_repo.get_by_slug(slug, shared=True)
+        if not article:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
+            )
+        return self._to_response(article)
+
+    async def get_articles_batch(
+        self, batch: ArticleBatchRequest, loaders: Loaders
+    ) -> Batch[ArticleSummaryResponse, Union[UUID, str]]:
+        if batch.ids is not None:
+            keys, rows = batch.ids, await loaders.articles.load_many(batch.ids)
+        else:
+            keys = batch.slugs
+            rows = await loaders.articles_by_slug.load_many(batch.slugs)
+        return Batch[ArticleSummaryResponse, Union[UUID, str]](
+            items=[row and self._to_summary(row) for row in rows],
+            missing=missing_keys(keys, rows),
+        )
+
+    async def get_article_payload(self, slug: str) -> CachedPayload:
+        """Сериализованная статья с ETag; при попадании в кеш БД не читается"""
+        cached = await article_cache.get(slug)
+        if cached is not None:
+            return cached
+
+        article = await self.article_repo.get_by_slug(slug, shared=True)
         if not article:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
             )
-        article_resp_data = article.__dict__
-        article_resp_data["tag_list"] = (
-            article.tag_list.split(",") if article.tag_list else []
+        payload = CachedPayload(
+            etag=make_etag(article.id, article.updated_at or article.created_at),
+            body=self._to_response(article).model_dump_json().encode(),
         )
-        article_response = ArticleResponse.model_validate(article_resp_data)
-        return article_response
+        await article_cache.set(slug, payload)
+        return payload
+
+    async def get_article_with_author(
+        self, slug: str, loaders: Loaders
+    ) -> ArticleWithAuthor:
+        """Статья с профилем автора; сама статья читается через кеш"""
+        payload = await self.get_article_payload(slug)
+        article = ArticleResponse.model_validate_json(payload.body)
+        [item] = await loaders.with_authors([article], ArticleWithAuthor)
+        return item
 
     async def update_article(
         self, slug: str, article_update: ArticleUpdate, author_id: UUID
@@ -83,20 +263,30 @@ class ArticleController:
                 detail="Вы не можете редактировать чужую статью",
             )
 
-        if article_update.title:
-            new_slug = await self._generate_slug(article_update.title, article.id)
-            article_update.slug = new_slug  # type: ignore
-
-        if article_update.tag_list is not None:
-            article_update.tag_list = ",".join(article_update.tag_list)  # type: ignore
+        update_data = article_update.model_dump(exclude_unset=True)
+        if "tag_list" in update_data:
+            update_data["tag_list"] = article_update.tag_list or []
 
-        updated_article = await self.article_repo.update(article, article_update)
-        article_resp_data = updated_article.__dict__
-        article_resp_data["tag_list"] = (
-            updated_article.tag_list.split(",") if updated_article.tag_list else []
-        )
-        article_response = ArticleResponse.model_validate(article_resp_data)
-        return article_response
+        # После отката при конфликте slug объект article просрочен,
+        # поэтому обновление идёт по id
+        article_id = article.id
+        if article_update.title:
+            updated_article = await self._save_with_slug(
+                article_update.title,
+                lambda slug: self.article_repo.update_by_id(
+                    article_id, ArticleUpdateDB(**update_data, slug=slug)
+                ),
+                exclude_id=article_id,
+            )
+        else:
+            updated_article = await self.article_repo.update(
+                article, ArticleUpdateDB(**update_data)
+            )
+        # Кеш сбрасывается после commit, иначе параллельное чтение могло бы
+        # снова закешировать старую версию
+        await self.db.commit()
+        await article_cache.delete(slug, updated_article.slug)
+        return self._to_response(updated_article)
 
     async def delete_article(self, slug: str, author_id: UUID) -> bool:
         article = await self.article_repo.get_by_slug(slug)
@@ -111,4 +301,164 @@ class ArticleController:
                 detail="Вы не можете удалять чужую статью",
             )
 
-        return await self.article_repo.delete(article.id)
+        deleted = await self.article_repo.delete(article.id)
+        await self.db.commit()
+        await article_cache.delete(slug)
+        return deleted
+
+    async def delete_articles(self, batch: ArticleBatchRequest, author_id: UUID) -> int:
+        """Удалить статьи по списку id или slug одним DELETE
+
+        Удаляются все статьи или ни одной: если какой-то нет (404) или она
+        чужая (403), ничего не удаляется.
+        """
+        if batch.ids is not None:
+            keys = batch.ids
+            rows = await self.article_repo.get_summaries_by_ids(batch.ids)
+            found = {row.id for row in rows}
+        else:
+            keys = batch.slugs
+            rows = await self.article_repo.get_summaries_by_slugs(batch.slugs)
+            found = {row.slug for row in rows}
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "message": "Статьи не найдены",
+                    "missing": [str(key) for key in missing],
+                },
+            )
+        if any(row.author_id != author_id for row in rows):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Вы не можете удалять чужие статьи",
+            )
+
+        deleted = await self.article_repo.delete_many([row.id for row in rows])
+        await self.db.commit()
+        await article_cache.delete(*(row.slug for row in rows))
+        return deleted
+
+    async def import_articles(
+        self,
+        lines: AsyncIterable[Tuple[int, Optional[bytes]]],
+        author_id: UUID,
+        chunk_size: int = 1000,
+    ) -> ArticleImportReport:
+        """Массовый импорт статей из строк NDJSON
+
+        Строки проверяются по ArticleBase и вставляются пачками по chunk_size,
+        каждая пачка в своей транзакции. Ошибки отдельных строк попадают
+        в отчёт и не прерывают импорт.
+        """
+        report = ArticleImportReport()
+        started = perf_counter()
+        chunk: List[Tuple[int, ArticleBase]] = []
+        async for line_no, line in lines:
+            article = self._parse_import_line(line_no, line, report)
+            if article is None:
+                continue
+            chunk.append((line_no, article))
+            if len(chunk) >= chunk_size:
+                await self._import_chunk(chunk, author_id, report)
+                chunk = []
+        if chunk:
+            await self._import_chunk(chunk, author_id, report)
+
+        report.elapsed_seconds = perf_counter() - started
+        if report.elapsed_seconds:
+            report.rows_per_second = report.imported / report.elapsed_seconds
+        return report
+
+    @staticmethod
+    def _import_failed(report: ArticleImportReport, line_no: int, error: str) -> None:
+        report.failed += 1
+        if len(report.errors) < IMPORT_MAX_ERRORS:
+            report.errors.append(ArticleImportError(line=line_no, error=error))
+        else:
+            report.errors_truncated = True
+
+    def _parse_import_line(
+        self, line_no: int, line: Optional[bytes], report: ArticleImportReport
+    ) -> Optional[ArticleBase]:
+        if line is None:
+            self._import_failed(report, line_no, "Строка слишком длинная")
+            return None
+        try:
+            return ArticleBase.model_validate_json(line)
+        except ValidationError as exc:
+            error = "; ".join(
+                f"{'.'.join(map(str, e['loc'])) or 'json'}: {e['msg']}"
+                for e in exc.errors()
+            )
+            self._import_failed(report, line_no, error)
+            return None
+
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, ArticleBase]],
+        author_id: UUID,
+        report: ArticleImportReport,
+    ) -> None:
+        pending = chunk
+        for _ in range(SLUG_ATTEMPTS):
+            if not pending:
+                return
+            slugs = await self.article_repo.allocate_slugs(
+                [slugify(article.title) for _, article in pending]
+            )
+            batch = [
+                (line_no, article, slug)
+                for (line_no, article), slug in zip(pending, slugs)
+            ]
+            inserted, failed = await self._insert_batch(batch, author_id, report)
+            report.imported += len(inserted)
+            # Slug успели занять параллельно: подбираем заново
+            pending = [
+                (line_no, article)
+                for line_no, article, slug in batch
+                if slug not in inserted and line_no not in failed
+            ]
+        for line_no, _ in pending:
+            self._import_failed(report, line_no, "Не удалось подобрать уникальный slug")
+
+    async def _insert_batch(
+        self,
+        batch: List[Tuple[int, ArticleBase, str]],
+        author_id: UUID,
+        report: ArticleImportReport,
+    ) -> Tuple[Set[str], Set[int]]:
+        """Вставить пачку; вернуть вставленные slug и номера строк с ошибками"""
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "slug": slug,
+                "title": article.title,
+                "description": article.description,
+                "body": article.body,
+                "tag_list": article.tag_list or [],
+                "author_id": author_id,
+            }
+            for _, article, slug in batch
+        ]
+        try:
+            inserted = await self.article_repo.insert_many(rows)
+            await self.db.commit()
+            return inserted, set()
+        except DBAPIError:
+            pass
+
+        # Пачка не вставилась целиком: вставляем по одной (каждую в своей
+        # транзакции), чтобы найти ошибочные строки
+        inserted: Set[str] = set()
+        failed: Set[int] = set()
+        for (line_no, _, _), row in zip(batch, rows):
+            try:
+                inserted |= await self.article_repo.insert_many([row])
+                await self.db.commit()
+            except DBAPIError as exc:
+                failed.add(line_no)
+                cause = getattr(exc.orig, "__cause__", None) or exc.orig
+                self._import_failed(report, line_no, str(cause))
+        return inserted, failed
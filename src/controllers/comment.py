@@ -1,61 +1,121 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.repositories.article import ArticleRepository
+from src.core.pagination import CursorKey, encode_cursor, next_cursor
 from src.repositories.comment import CommentRepository
-from src.schemas.comment import CommentBase, CommentCreate
+from src.repositories.loaders import Loaders
+from src.schemas.comment import (CommentBase, CommentExportLine,
+                                 CommentResponse, CommentWithAuthor)
+from src.schemas.pagination import Page
+
+
+def article_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
+    )
 
 
 class CommentController:
 
     def __init__(self, db: AsyncSession):
+        self.db = db
         self.comment_repo = CommentRepository(db)
-        self.article_repo = ArticleRepository(db)
 
     async def create_comment(self, slug: str, comment_in: CommentBase, author_id: UUID):
-        article = await self.article_repo.get_by_slug(slug)
-        if not article:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
-            )
-
-        comment_data = comment_in.model_dump()
-        comment_data["article_id"] = article.id
-        comment_data["author_id"] = author_id
-        comment = await self.comment_repo.create(CommentCreate(**comment_data))
+        comment = await self.comment_repo.create_for_article_slug(
+            slug, comment_in.body, author_id
+        )
+        if not comment:
+            raise article_not_found()
+        await self.db.commit()
         return comment
 
-    async def get_article_comments(self, slug: str, skip: int = 0, limit: int = 20):
-        article = await self.article_repo.get_by_slug(slug)
-        if not article:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
+    async def get_article_comments(
+        self,
+        slug: str,
+        skip: int = 0,
+        limit: int = 20,
+        loaders: Optional[Loaders] = None,
+    ):
+        found = await self.comment_repo.get_by_article_slug(
+            slug, skip, limit, shared=True
+        )
+        if found is None:
+            raise article_not_found()
+        _, comments = found
+
+        if loaders is None:
+            return comments
+        return await self._with_authors(comments, loaders)
+
+    async def get_article_comments_page(
+        self,
+        slug: str,
+        after: Optional[CursorKey] = None,
+        limit: int = 20,
+        loaders: Optional[Loaders] = None,
+    ) -> Page:
+        found = await self.comment_repo.get_page_by_article_slug(
+            slug, after, limit + 1, shared=True
+        )
+        if found is None:
+            raise article_not_found()
+        _, comments = found
+
+        if loaders is None:
+            return Page[CommentResponse](
+                items=[CommentResponse.model_validate(c) for c in comments[:limit]],
+                next_cursor=next_cursor(comments, limit),
             )
-        return await self.comment_repo.get_by_article_id(article.id, skip, limit)
+        return Page[CommentWithAuthor](
+            items=await self._with_authors(comments[:limit], loaders),
+            next_cursor=next_cursor(comments, limit),
+        )
+
+    @staticmethod
+    async def _with_authors(comments, loaders: Loaders) -> List[CommentWithAuthor]:
+        items = [CommentResponse.model_validate(c) for c in comments]
+        return await loaders.with_authors(items, CommentWithAuthor)
 
     async def delete_comment(
         self, slug: str, comment_id: UUID, author_id: UUID
     ) -> bool:
-        article = await self.article_repo.get_by_slug(slug)
-        if not article:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Статья не найдена"
-            )
+        if await self.comment_repo.delete_by_article_slug(slug, comment_id, author_id):
+            await self.db.commit()
+            return True
 
-        comment = await self.comment_repo.get_by_article_and_comment_id(
-            article.id, comment_id
-        )
-        if not comment:
+        # Ничего не удалено: отдельным запросом выясняем причину
+        found = await self.comment_repo.get_author_by_article_slug(slug, comment_id)
+        if found is None:
+            raise article_not_found()
+        if found.author_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Комментарий не найден"
             )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Вы не можете удалять чужой комментарий",
+        )
 
-        if comment.author_id != author_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Вы не можете удалять чужой комментарий",
+    async def export_comments(
+        self,
+        after: Optional[CursorKey] = None,
+        author_id: Optional[UUID] = None,
+        tag: Optional[str] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+    ) -> AsyncIterator[bytes]:
+        """Комментарии в NDJSON: {"cursor": ..., "comment": {...}} на строку"""
+        rows = self.comment_repo.stream_for_export(
+            after, author_id, tag, updated_from, updated_to
+        )
+        async for row in rows:
+            line = CommentExportLine(
+                cursor=encode_cursor(row.created_at, row.id),
+                comment=CommentResponse.model_validate(row),
             )
-
-        return await self.comment_repo.delete(comment_id)
+            yield line.model_dump_json().encode() + b"\n"
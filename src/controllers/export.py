@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import AsyncIterator, Literal, Optional
+from uuid import UUID
+
+from src.controllers.article import ArticleController
+from src.controllers.comment import CommentController
+from src.core.database import AsyncSessionLocal
+from src.core.pagination import CursorKey
+
+ExportResource = Literal["articles", "comments"]
+
+
+async def export_lines(
+    resource: ExportResource,
+    after: Optional[CursorKey] = None,
+    author_id: Optional[UUID] = None,
+    tag: Optional[str] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+) -> AsyncIterator[bytes]:
+    """Выгрузка в NDJSON в собственной сессии
+
+    Потоковый ответ отдаётся дольше, чем живёт сессия запроса, поэтому
+    серверный курсор открывается в отдельной сессии и закрывается вместе
+    с генератором (в том числе при обрыве соединения).
+    """
+    async with AsyncSessionLocal() as db:
+        if resource == "comments":
+            lines = CommentController(db).export_comments(
+                after, author_id, tag, updated_from, updated_to
+            )
+        else:
+            lines = ArticleController(db).export_articles(
+                after, author_id, tag, updated_from, updated_to
+            )
+        async for line in lines:
+            yield line
@@ -0,0 +1,16 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.tag import TagRepository
+from src.schemas.tag import TagResponse
+
+
+class TagController:
+
+    def __init__(self, db: AsyncSession):
+        self.tag_repo = TagRepository(db)
+
+    async def get_tags(self, limit: int = 100) -> List[TagResponse]:
+        tags = await self.tag_repo.get_popular(limit)
+        return [TagResponse.model_validate(tag) for tag in tags]
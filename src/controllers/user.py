@@ -1,13 +1,18 @@
 from datetime import timedelta
+from typing import List
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import principal_cache
 from src.core.config import settings
+from src.core.dataloader import missing_keys
 from src.core.security import security_service
+from src.repositories.loaders import Loaders
 from src.repositories.user import UserRepository
-from src.schemas.user import UserCreate, UserLogin, UserUpdate
+from src.schemas.batch import Batch
+from src.schemas.user import UserCreate, UserLogin, UserProfile, UserUpdate
 
 jwt_settings = settings.jwt_settings
 
@@ -15,6 +20,7 @@ jwt_settings = settings.jwt_settings
 class UserController:
 
     def __init__(self, db: AsyncSession):
+        self.db = db
         self.user_repo = UserRepository(db)
 
     async def register(self, user_in: UserCreate):
@@ -30,6 +36,7 @@ class UserController:
             )
 
         user = await self.user_repo.create_with_password(user_in)
+        await self.db.commit()
         return user
 
     async def login(self, credentials: UserLogin):
@@ -56,6 +63,15 @@ class UserController:
             )
         return user
 
+    async def get_profiles(
+        self, ids: List[UUID], loaders: Loaders
+    ) -> Batch[UserProfile, UUID]:
+        users = await loaders.users.load_many(ids)
+        return Batch[UserProfile, UUID](
+            items=[user and UserProfile.model_validate(user) for user in users],
+            missing=missing_keys(ids, users),
+        )
+
     async def update_user(self, user_id: UUID, user_update: UserUpdate):
         user = await self.user_repo.get(user_id)
         if not user:
@@ -78,4 +94,6 @@ class UserController:
                 )
 
         updated_user = await self.user_repo.update(user, user_update)
+        await self.db.commit()
+        await principal_cache.delete(str(user_id))
         return updated_user
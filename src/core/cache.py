@@ -0,0 +1,300 @@
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
+from typing import Any, Generic, Hashable, Optional, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.core.config import settings
+from src.schemas.user import UserPrincipal
+
+cache_settings = settings.cache_settings
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class TTLCache:
+    """In-process LRU кеш с ограничением по времени жизни записей"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+        # Метрики
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            # TTL 0 выключает кеш
+            return
+        self._data[key] = (monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Снимок метрик кеша"""
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class CacheBackend(ABC):
+    """Хранилище байтовых значений для read-through кеша"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    async def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        """Метрики хранилища (у общего сервера кеша их нет)"""
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """Бэкенд в памяти процесса (у каждого воркера свой)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+    def stats(self) -> dict:
+        stats = self.cache.stats()
+        return {name: stats[name] for name in ("size", "maxsize", "evictions")}
+
+
+class RedisBackend(CacheBackend):
+    """Бэкенд поверх клиента с API redis.asyncio (Redis, Valkey, ...)
+
+    Ошибки сервера кеша не пробрасываются: чтение считается промахом,
+    и запрос уходит в БД.
+    """
+
+    def __init__(self, client: Any, errors: tuple = (OSError,)):
+        self.client = client
+        self.errors = errors
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis import asyncio as redis
+            from redis.exceptions import RedisError
+        except ImportError as exc:
+            raise RuntimeError(
+                "Для CACHE_ARTICLE_BACKEND=redis нужен пакет redis"
+            ) from exc
+        return cls(redis.from_url(url), errors=(RedisError, OSError))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.client.get(key)
+        except self.errors:
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self.client.set(key, value, px=int(ttl * 1000))
+        except self.errors:
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except self.errors:
+            logger.warning("Cache delete failed for %s", keys, exc_info=True)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """Сериализованный ответ и его ETag"""
+
+    etag: str
+    body: bytes
+
+
+class PayloadCache:
+    """Read-through кеш сериализованных ответов поверх CacheBackend"""
+
+    def __init__(self, backend: CacheBackend, prefix: str, ttl: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl = ttl
+
+        # Метрики
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[CachedPayload]:
+        raw = await self.backend.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, _, body = raw.partition(b"\n")
+        return CachedPayload(etag=etag.decode(), body=body)
+
+    async def set(self, key: str, payload: CachedPayload) -> None:
+        raw = payload.etag.encode() + b"\n" + payload.body
+        await self.backend.set(self.prefix + key, raw, self.ttl)
+
+    async def delete(self, *keys: str) -> None:
+        await self.backend.delete(*(self.prefix + key for key in keys))
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        """Снимок метрик кеша"""
+        return {"hits": self.hits, "misses": self.misses, **self.backend.stats()}
+
+
+class ModelCache(Generic[M]):
+    """Кеш pydantic-моделей (JSON) поверх CacheBackend"""
+
+    def __init__(self, backend: CacheBackend, model: Type[M], prefix: str, ttl: float):
+        self.backend = backend
+        self.model = model
+        self.prefix = prefix
+        self.ttl = ttl
+
+        # Метрики
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[M]:
+        if self.ttl <= 0:
+            # TTL 0 выключает кеш: не ходим в бэкенд зря
+            return None
+        raw = await self.backend.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.model.model_validate_json(raw)
+
+    async def set(self, key: str, value: M) -> None:
+        if self.ttl <= 0:
+            return
+        await self.backend.set(
+            self.prefix + key, value.model_dump_json().encode(), self.ttl
+        )
+
+    async def delete(self, *keys: str) -> None:
+        await self.backend.delete(*(self.prefix + key for key in keys))
+
+    def stats(self) -> dict:
+        """Снимок метрик кеша"""
+        return {"hits": self.hits, "misses": self.misses, **self.backend.stats()}
+
+
+def make_etag(id: UUID, version: datetime) -> str:
+    """Сильный ETag по идентификатору и времени последнего изменения"""
+    digest = hashlib.blake2b(f"{id}:{version.isoformat()}".encode(), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверить заголовок If-None-Match (слабое сравнение, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in tags
+
+
+def _redis_backend() -> Optional[CacheBackend]:
+    if cache_settings.article_backend == "redis":
+        return RedisBackend.from_url(cache_settings.redis_url)
+    return None
+
+
+# Общий для воркеров бэкенд (один клиент на все кеши); None — кеши в памяти
+shared_backend = _redis_backend()
+
+
+def cache_backend(maxsize: int, ttl: float) -> CacheBackend:
+    """Общий бэкенд redis или отдельный кеш в памяти процесса"""
+    if shared_backend is not None:
+        return shared_backend
+    return MemoryBackend(maxsize=maxsize, ttl=ttl)
+
+
+# Сериализованные статьи (ArticleResponse) по slug
+article_cache = PayloadCache(
+    cache_backend(cache_settings.article_maxsize, cache_settings.article_ttl_seconds),
+    prefix="article:",
+    ttl=cache_settings.article_ttl_seconds,
+)
+
+# Аутентифицированные пользователи (UserPrincipal) по user_id
+principal_cache = ModelCache(
+    cache_backend(
+        cache_settings.principal_maxsize, cache_settings.principal_ttl_seconds
+    ),
+    UserPrincipal,
+    prefix="principal:",
+    ttl=cache_settings.principal_ttl_seconds,
+)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,7 +17,35 @@ class DatabaseSettings(BaseSettings):
     postgres_address: str = "postgres"
     
     postgres_db: str = "blog_db"
+
+    # queue — пул соединений в процессе; null — новое соединение на каждую
+    # сессию (когда пулом управляет PgBouncer)
+    db_pool_class: Literal["queue", "null"] = "queue"
     db_pool_size: int = 10
+    db_max_overflow: int = 10
+    # Сколько ждать свободного соединения, прежде чем вернуть ошибку
+    db_pool_timeout: float = 30
+    # Переоткрывать соединения старше N секунд (-1 — никогда)
+    db_pool_recycle: int = 1800
+    # SELECT 1 при каждой выдаче соединения из пула
+    db_pool_pre_ping: bool = False
+    # Проверять только соединения, простоявшие в пуле дольше N секунд (0 — не проверять)
+    db_pool_ping_idle_seconds: float = 30
+    # Кеш подготовленных выражений asyncpg на соединение (0 — выключить)
+    db_statement_cache_size: int = 100
+    # Режим transaction pooling PgBouncer: без кеша подготовленных выражений
+    # и с уникальными именами выражений
+    db_pgbouncer: bool = False
+
+    # Реплики для чтения: JSON-список URL в формате database_url
+    db_replica_urls: List[str] = []
+    # Реплика с большим отставанием исключается из чтений
+    db_replica_max_lag_seconds: float = 5
+    db_replica_check_interval_seconds: float = 5
+    # Сколько секунд после записи клиент читает с primary
+    db_read_your_writes_seconds: int = 10
+    # Сколько отметок о записи хранить в памяти процесса (бэкенд кешей memory)
+    db_read_your_writes_maxsize: int = 10000
 
     model_config = SettingsConfigDict(
         env_file=env_file_path,
@@ -28,7 +56,7 @@ class DatabaseSettings(BaseSettings):
 
     @property
     def database_url(self) -> str:
-        return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_address}:5432/{self.postgres_db}"
+        return f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}@{self.postgres_address}:{self.db_port}/{self.postgres_db}"
 
 
 class JWTSettings(BaseSettings):
@@ -55,6 +83,8 @@ class APISettings(BaseSettings):
     app_host: str = "0.0.0.0"
     app_port: int = 8000
     debug: bool = False
+    # Сериализовать ответы сразу в байты (см. src/core/responses.py)
+    fast_responses: bool = False
 
     model_config = SettingsConfigDict(
         env_prefix="API_",
@@ -64,12 +94,125 @@ class APISettings(BaseSettings):
     )
 
 
+class ServerSettings(BaseSettings):
+    """Production server (uvicorn workers) configuration"""
+
+    # По умолчанию — число доступных процессу CPU
+    workers: Optional[int] = None
+    # auto выбирает uvloop и httptools, если они установлены
+    loop: Literal["auto", "asyncio", "uvloop"] = "auto"
+    http: Literal["auto", "h11", "httptools"] = "auto"
+    # Перезапускать воркер после N запросов (+ случайно до jitter),
+    # чтобы воркеры не перезапускались одновременно
+    max_requests: Optional[int] = None
+    max_requests_jitter: int = 0
+    # Сколько ждать завершения запросов в обработке после SIGTERM
+    graceful_timeout_seconds: int = 30
+    keep_alive_seconds: int = 5
+
+    model_config = SettingsConfigDict(
+        env_prefix="SERVER_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class PasswordHashingSettings(BaseSettings):
+    """Password hashing pool configuration"""
+
+    executor: Literal["process", "thread"] = "process"
+    workers: Optional[int] = None
+    max_queue: int = 64
+    retry_after_seconds: int = 1
+
+    model_config = SettingsConfigDict(
+        env_prefix="PASSWORD_HASH_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class CacheSettings(BaseSettings):
+    """Cache configuration"""
+
+    principal_ttl_seconds: float = 60
+    principal_maxsize: int = 10000
+
+    # Бэкенд всех кешей: memory (в процессе, один воркер) или redis (общий)
+    article_backend: Literal["memory", "redis"] = "memory"
+    article_ttl_seconds: float = 300
+    article_maxsize: int = 10000
+    redis_url: str = "redis://localhost:6379/0"
+
+    model_config = SettingsConfigDict(
+        env_prefix="CACHE_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class SingleFlightSettings(BaseSettings):
+    """Read coalescing configuration"""
+
+    enabled: bool = True
+    timeout_seconds: float = 5
+
+    model_config = SettingsConfigDict(
+        env_prefix="SINGLE_FLIGHT_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class InstrumentationSettings(BaseSettings):
+    """Per-request SQL instrumentation configuration"""
+
+    enabled: bool = True
+    # Заголовок Server-Timing с числом запросов и временем в БД
+    server_timing: bool = True
+    slow_query_ms: float = 200
+    # Предупреждать, если одинаковый запрос выполнен больше N раз за запрос
+    n_plus_one_threshold: int = 10
+    # По умолчанию предупреждения включены только при ENV=development
+    warn_n_plus_one: Optional[bool] = None
+
+    model_config = SettingsConfigDict(
+        env_prefix="INSTRUMENTATION_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
+class MetricsSettings(BaseSettings):
+    """Prometheus metrics configuration"""
+
+    enabled: bool = True
+
+    model_config = SettingsConfigDict(
+        env_prefix="METRICS_",
+        env_file=env_file_path,
+        env_file_encoding="utf-8",
+        extra="ignore",
+    )
+
+
 class Settings(BaseSettings):
 
     env: str = "development"
     database_settings: DatabaseSettings = DatabaseSettings()
     jwt_settings: JWTSettings = JWTSettings()
     api_settings: APISettings = APISettings()
+    server_settings: ServerSettings = ServerSettings()
+    password_hashing_settings: PasswordHashingSettings = PasswordHashingSettings()
+    cache_settings: CacheSettings = CacheSettings()
+    single_flight_settings: SingleFlightSettings = SingleFlightSettings()
+    instrumentation_settings: InstrumentationSettings = InstrumentationSettings()
+    metrics_settings: MetricsSettings = MetricsSettings()
 
     @property
     def database_url(self) -> str:
@@ -1,38 +1,243 @@
-from typing import AsyncGenerator
+import os
+import uuid
+from time import monotonic
+from typing import AsyncGenerator, Callable, Optional
 
-from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
-                                    create_async_engine)
+from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (AsyncEngine, AsyncSession,
+                                    async_sessionmaker, create_async_engine)
 from sqlalchemy.orm import declarative_base
 
-from src.core.config import settings
+from src.core.cache import cache_backend
+from src.core.config import DatabaseSettings, settings
+from src.core.instrumentation import instrument_engine
+from src.core.metrics import (TimedNullPool, TimedQueuePool,
+                              register_pool_metrics)
+from src.core.replicas import (Replica, ReplicaRouter, WriteMarkers,
+                               reads_primary)
+from src.core.security import security_service
 
 database_url = settings.database_url
 echo = settings.api_settings.debug
 
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(database_settings: DatabaseSettings) -> dict:
+    """Параметры create_async_engine для пула и драйвера"""
+    cache_size = database_settings.db_statement_cache_size
+    connect_args = {}
+    if database_settings.db_pgbouncer:
+        # В transaction pooling соседние запросы идут в разные соединения
+        # сервера: подготовленные выражения нельзя переиспользовать, а имена
+        # по порядку (__asyncpg_stmt_1__) пересекаются между клиентами
+        cache_size = 0
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+    # Кеш asyncpg и кеш подготовленных выражений адаптера SQLAlchemy
+    connect_args["statement_cache_size"] = cache_size
+    connect_args["prepared_statement_cache_size"] = cache_size
+
+    options = {
+        "connect_args": connect_args,
+        "pool_pre_ping": database_settings.db_pool_pre_ping,
+    }
+    if database_settings.db_pool_class == "null":
+        options["poolclass"] = TimedNullPool
+    else:
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=database_settings.db_pool_size,
+            max_overflow=database_settings.db_max_overflow,
+            pool_timeout=database_settings.db_pool_timeout,
+            pool_recycle=database_settings.db_pool_recycle,
+        )
+    return options
+
+
+def ping_idle_connections(engine: Engine, idle_seconds: float) -> None:
+    """Проверять при выдаче только соединения, простоявшие дольше idle_seconds
+
+    Дешевле pool_pre_ping: под нагрузкой соединения возвращаются в пул
+    через миллисекунды и не проверяются, а после простоя (когда их мог
+    закрыть сервер, PgBouncer или балансировщик) — проверяются. Упавшая
+    проверка заменяет соединение новым.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            dbapi_connection.ping()
+        except Exception as error:
+            # Пул закроет соединение и выдаст другое
+            raise exc.DisconnectionError() from error
+
+
+def configure_engine(
+    engine: Engine, database_settings: DatabaseSettings, name: str = "primary"
+) -> None:
+    """Учёт запросов, метрики пула и проверка соединений (engine.sync_engine)"""
+    instrument_engine(engine)
+    register_pool_metrics(engine, name)
+    if (
+        database_settings.db_pool_class == "queue"
+        and not database_settings.db_pool_pre_ping
+        and database_settings.db_pool_ping_idle_seconds > 0
+    ):
+        ping_idle_connections(engine, database_settings.db_pool_ping_idle_seconds)
+
+
+def _sessionmaker(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+database_settings = settings.database_settings
+
 engine = create_async_engine(
-    database_url,
-    echo=echo,
-    pool_pre_ping=True,
-    pool_size=settings.database_settings.db_pool_size,
+    database_url, echo=echo, **engine_options(database_settings)
 )
+configure_engine(engine.sync_engine, database_settings)
 
 # AsyncSessionLocal для создания асинхронных сессий
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+AsyncSessionLocal = _sessionmaker(engine)
+
+# Реплики для чтения (без реплик router отдаёт AsyncSessionLocal)
+replicas = []
+for n, url in enumerate(database_settings.db_replica_urls):
+    replica_engine = create_async_engine(
+        url, echo=echo, **engine_options(database_settings)
+    )
+    configure_engine(replica_engine.sync_engine, database_settings, f"replica-{n}")
+    replicas.append(
+        Replica(f"replica-{n}", replica_engine, _sessionmaker(replica_engine))
+    )
+read_router = ReplicaRouter(
+    AsyncSessionLocal,
+    replicas,
+    max_lag_seconds=database_settings.db_replica_max_lag_seconds,
+    check_interval=database_settings.db_replica_check_interval_seconds,
 )
+read_router.register_metrics()
+
+# Отметки о записи пользователей для read-your-writes. С бэкендом memory
+# у них своё хранилище, чтобы статьи не вытесняли отметки (и наоборот)
+write_markers = WriteMarkers(
+    cache_backend(
+        database_settings.db_read_your_writes_maxsize,
+        database_settings.db_read_your_writes_seconds,
+    ),
+    database_settings.db_read_your_writes_seconds,
+)
+
+
+def _reset_pool_after_fork() -> None:
+    # Соединения родителя нельзя использовать в дочернем процессе: новый пул
+    # без закрытия унаследованных сокетов (ими продолжает владеть родитель)
+    engine.sync_engine.dispose(close=False)
+    for replica in replicas:
+        replica.engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_after_fork)
 
 # Base для ORM моделей
 Base = declarative_base()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Зависимость для получения асинхронной сессии БД"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+class UnitOfWork:
+    """Сессия HTTP-запроса, создаваемая при первом обращении
+
+    Ведёт себя как AsyncSession (атрибуты передаются сессии), но создаёт её
+    только при первом использовании: запрос, обслуженный из кешей, не
+    открывает ни сессию, ни соединение. Репозитории не коммитят —
+    контроллер фиксирует изменения одним commit() в конце операции,
+    незафиксированное откатывается при закрытии.
+    """
+
+    def __init__(self, choose_sessionmaker: Callable[[], async_sessionmaker]):
+        self._choose_sessionmaker = choose_sessionmaker
+        self._sessionmaker: Optional[async_sessionmaker] = None
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def sessionmaker(self) -> async_sessionmaker:
+        if self._sessionmaker is None:
+            self._sessionmaker = self._choose_sessionmaker()
+        return self._sessionmaker
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.sessionmaker()
+        return self._session
+
+    @property
+    def bind(self) -> AsyncEngine:
+        # Для чтений в отдельной сессии (single flight) своя сессия не нужна
+        return self.sessionmaker.kw["bind"]
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
+async def get_db() -> AsyncGenerator[UnitOfWork, None]:
+    """Сессия БД запроса, общая для аутентификации и контроллера"""
+    db = UnitOfWork(lambda: AsyncSessionLocal)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+async def _recently_wrote(request: Request) -> bool:
+    """Владелец Bearer-токена запроса недавно писал (см. WriteMarkers)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    user_id = security_service.decode_token(token)
+    return user_id is not None and await write_markers.recent(user_id)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[UnitOfWork, None]:
+    """Сессия для чтения: реплика, а после недавней записи клиента — primary"""
+    sticky = reads_primary(request)
+    if not sticky and read_router.replicas:
+        sticky = await _recently_wrote(request)
+    db = UnitOfWork(lambda: read_router.sessionmaker(sticky=sticky))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,96 @@
+import asyncio
+from typing import (Awaitable, Callable, Dict, Generic, Hashable, Iterable,
+                    List, Mapping, Optional, Sequence, Set, TypeVar)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Пакетная загрузка по ключам с кешем на время запроса
+
+    Ключи, запрошенные до следующей итерации event loop, собираются
+    в один вызов batch_fn (не больше max_batch_size ключей за раз).
+    Повторный ключ не загружается заново: возвращается тот же результат.
+    batch_fn возвращает найденные значения по ключам; отсутствующий
+    ключ даёт None.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]],
+        max_batch_size: int = 1000,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Метрики
+        self.loads = 0
+        self.batches = 0
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        self.loads += 1
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            if not self._queue:
+                self._spawn(self._dispatch())
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        """Значения в порядке ключей; повторы загружаются один раз"""
+        return list(await asyncio.gather(*map(self.load, keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Положить уже известное значение, чтобы не загружать его"""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def _spawn(self, coro: Awaitable) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        # Ключи успевают добавить и задачи, запущенные в том же шаге loop
+        await asyncio.sleep(0)
+        keys, self._queue = self._queue, []
+        for start in range(0, len(keys), self.max_batch_size):
+            self._spawn(self._load_batch(keys[start : start + self.max_batch_size]))
+
+    async def _load_batch(self, keys: List[K]) -> None:
+        self.batches += 1
+        try:
+            found = await self.batch_fn(keys)
+        except asyncio.CancelledError:
+            for key in keys:
+                self._cache.pop(key).cancel()
+            raise
+        except Exception as exc:
+            # Ошибку не кешируем: следующий load повторит загрузку
+            for key in keys:
+                future = self._cache.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():
+                future.set_result(found.get(key))
+
+    def stats(self) -> dict:
+        """Снимок метрик загрузчика"""
+        return {"loads": self.loads, "batches": self.batches, "keys": len(self._cache)}
+
+
+def missing_keys(keys: Iterable[K], values: Sequence[Optional[V]]) -> List[K]:
+    """Ключи, для которых load_many вернул None (без повторов, по порядку)"""
+    return list(dict.fromkeys(key for key, value in zip(keys, values) if value is None))
@@ -0,0 +1,166 @@
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+
+instrumentation_settings = settings.instrumentation_settings
+
+logger = logging.getLogger(__name__)
+
+# Сколько символов запроса писать в лог
+STATEMENT_LOG_LIMIT = 1000
+
+
+def _warn_n_plus_one() -> bool:
+    if instrumentation_settings.warn_n_plus_one is not None:
+        return instrumentation_settings.warn_n_plus_one
+    return settings.env == "development"
+
+
+@dataclass
+class QueryStats:
+    """SQL-запросы, выполненные за время одного HTTP-запроса"""
+
+    # "METHOD path" HTTP-запроса, для логов
+    request: str = ""
+    queries: int = 0
+    db_seconds: float = 0.0
+    slow_queries: int = 0
+    # Ожидание соединения из пула (или подключения)
+    pool_wait_seconds: float = 0.0
+    # Текст запроса с плейсхолдерами -> сколько раз выполнен
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float, slow: bool) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        self.slow_queries += slow
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list:
+        """Запросы, выполненные больше threshold раз (вероятный N+1)"""
+        return [
+            (statement, count)
+            for statement, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"pool;dur={self.pool_wait_seconds * 1000:.1f}, "
+            f"app;dur={total_seconds * 1000:.1f}"
+        )
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Статистика текущего HTTP-запроса (None вне запроса)"""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+    slow = elapsed * 1000 >= instrumentation_settings.slow_query_ms
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed, slow)
+    if slow:
+        logger.warning(
+            "Slow query %.1f ms: %s",
+            elapsed * 1000,
+            statement[:STATEMENT_LOG_LIMIT],
+            extra={
+                "request": stats.request if stats is not None else None,
+                "duration_ms": round(elapsed * 1000, 1),
+                "statement": statement[:STATEMENT_LOG_LIMIT],
+                "executemany": executemany,
+            },
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # after_cursor_execute не вызывается для упавших запросов
+    conn = exception_context.connection
+    started = conn.info.get("query_started") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Подключить учёт запросов к движку (для AsyncEngine — engine.sync_engine)"""
+    if not instrumentation_settings.enabled:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Считает SQL-запросы каждого HTTP-запроса
+
+    Добавляет заголовок Server-Timing (запросы, выполненные до начала
+    ответа), а после ответа предупреждает о повторяющихся запросах.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not instrumentation_settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(request=f"{scope['method']} {scope['path']}")
+        token = _current.set(stats)
+        started = perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and instrumentation_settings.server_timing
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", stats.server_timing(perf_counter() - started)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._report(stats)
+
+    @staticmethod
+    def _report(stats: QueryStats) -> None:
+        if not _warn_n_plus_one():
+            return
+        threshold = instrumentation_settings.n_plus_one_threshold
+        for statement, count in stats.repeated(threshold):
+            logger.warning(
+                "Possible N+1: %s ran the same query %d times: %s",
+                stats.request,
+                count,
+                statement[:STATEMENT_LOG_LIMIT],
+                extra={
+                    "request": stats.request,
+                    "count": count,
+                    "statement": statement[:STATEMENT_LOG_LIMIT],
+                },
+            )
@@ -0,0 +1,400 @@
+from bisect import bisect_left
+from math import inf
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.cache import article_cache, principal_cache
+from src.core.instrumentation import current_stats
+from src.core.security import password_hasher
+from src.core.singleflight import single_flight
+
+LabelValues = Tuple[str, ...]
+# Значения метрики, вычисляемые в момент выгрузки
+Collect = Callable[[], Dict[LabelValues, float]]
+
+# Границы корзин гистограмм по умолчанию, секунды
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Метрика в формате Prometheus text exposition
+
+    Значения агрегируются по кортежу значений меток прямо при записи,
+    поэтому запись — это поиск в словаре и сложение.
+    """
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Collect] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self._values: Dict[LabelValues, float] = {}
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], LabelValues, float]]:
+        values = self.collect() if self.collect is not None else self._values
+        for labels, value in values.items():
+            yield "", self.labelnames, labels, value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for suffix, names, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_labels(names, labels)} {_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Метки -> [число наблюдений в каждой корзине (последняя — +Inf), сумма]
+        self._states: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        state = self._states.get(labels)
+        if state is None:
+            state = self._states[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], LabelValues, float]]:
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in self._states.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (inf,), counts):
+                cumulative += count
+                yield "_bucket", names, labels + (_value(bound),), cumulative
+            yield "_sum", self.labelnames, labels, total
+            yield "_count", self.labelnames, labels, cumulative
+
+
+class Registry:
+    """Набор метрик, выгружаемых эндпоинтом /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP
+http_requests = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests being processed",
+    collect=lambda: {(): MetricsMiddleware.in_flight},
+)
+
+# Пул соединений БД
+db_pool_checkout = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool (waiting or connecting)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+)
+
+
+class TimedCheckoutMixin:
+    """Замер времени выдачи соединения: в метрики и в статистику HTTP-запроса"""
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            db_pool_checkout.observe(elapsed)
+            stats = current_stats()
+            if stats is not None:
+                stats.pool_wait_seconds += elapsed
+
+
+class TimedQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """Пул соединений, замеряющий время выдачи соединения"""
+
+
+class TimedNullPool(TimedCheckoutMixin, NullPool):
+    """Соединение на каждую выдачу, с замером времени подключения"""
+
+
+# Движки с пулом очереди по именам (primary, replica-0, ...)
+_pool_engines: Dict[str, Engine] = {}
+
+
+def _pool_stat(name: str) -> Collect:
+    # engine.pool заменяется при dispose(), поэтому читаем его каждый раз
+    return lambda: {
+        (engine_name,): getattr(engine.pool, name)()
+        for engine_name, engine in _pool_engines.items()
+    }
+
+
+registry.gauge(
+    "db_pool_size", "Configured pool size", ("engine",), collect=_pool_stat("size")
+)
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    ("engine",),
+    collect=_pool_stat("checkedout"),
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections above pool size (negative while the pool is filling)",
+    ("engine",),
+    collect=_pool_stat("overflow"),
+)
+registry.gauge(
+    "db_pool_checked_in",
+    "Idle connections in the pool",
+    ("engine",),
+    collect=_pool_stat("checkedin"),
+)
+
+
+def register_pool_metrics(engine: Engine, name: str = "primary") -> None:
+    """Метрики пула движка (для AsyncEngine — engine.sync_engine)"""
+    # У NullPool нет размера и простаивающих соединений
+    if isinstance(engine.pool, QueuePool):
+        _pool_engines[name] = engine
+
+
+# Хеширование паролей
+def _hasher_stat(name: str) -> Collect:
+    return lambda: {(): password_hasher.stats()[name]}
+
+
+registry.gauge(
+    "password_hash_workers", "Password hashing workers", collect=_hasher_stat("workers")
+)
+registry.gauge(
+    "password_hash_queue_depth",
+    "Password hashing tasks waiting for a worker",
+    collect=_hasher_stat("queue_depth"),
+)
+registry.counter(
+    "password_hash_rejected_total",
+    "Password hashing tasks rejected with 503",
+    collect=_hasher_stat("rejected"),
+)
+registry.counter(
+    "password_hash_completed_total",
+    "Password hashing tasks completed",
+    collect=_hasher_stat("completed"),
+)
+registry.counter(
+    "password_hash_seconds_total",
+    "Total password hashing latency",
+    collect=_hasher_stat("latency_seconds_total"),
+)
+
+# Кеши
+CACHES = {
+    "principal": principal_cache,
+    "article": article_cache,
+}
+
+
+def _cache_stat(name: str) -> Collect:
+    def collect() -> Dict[LabelValues, float]:
+        values = {}
+        for cache, c in CACHES.items():
+            stats = c.stats()
+            if name in stats:
+                values[(cache,)] = stats[name]
+        return values
+
+    return collect
+
+
+def _cache_hit_ratio() -> Dict[LabelValues, float]:
+    ratios = {}
+    for cache, c in CACHES.items():
+        stats = c.stats()
+        lookups = stats["hits"] + stats["misses"]
+        ratios[(cache,)] = stats["hits"] / lookups if lookups else 0
+    return ratios
+
+
+registry.counter(
+    "cache_hits_total", "Cache hits", ("cache",), collect=_cache_stat("hits")
+)
+registry.counter(
+    "cache_misses_total", "Cache misses", ("cache",), collect=_cache_stat("misses")
+)
+registry.gauge(
+    "cache_hit_ratio",
+    "Cache hits / lookups since start",
+    ("cache",),
+    collect=_cache_hit_ratio,
+)
+registry.gauge(
+    "cache_entries", "In-process cache entries", ("cache",), collect=_cache_stat("size")
+)
+registry.counter(
+    "cache_evictions_total",
+    "In-process cache LRU evictions",
+    ("cache",),
+    collect=_cache_stat("evictions"),
+)
+
+# Объединение чтений
+registry.counter(
+    "single_flight_calls_total",
+    "Coalescible reads",
+    collect=lambda: {(): single_flight.calls},
+)
+registry.counter(
+    "single_flight_coalesced_total",
+    "Reads served by another in-flight read",
+    collect=lambda: {(): single_flight.coalesced},
+)
+registry.gauge(
+    "single_flight_in_flight",
+    "Reads currently being executed for waiting callers",
+    collect=lambda: {(): single_flight.in_flight},
+)
+registry.counter(
+    "single_flight_timeouts_total",
+    "Followers that stopped waiting and ran the read themselves",
+    collect=lambda: {(): single_flight.timeouts},
+)
+
+
+class MetricsMiddleware:
+    """Число запросов, задержки и запросы в обработке по маршрутам
+
+    Маршрут берётся по шаблону пути (`/api/articles/{slug}`), поэтому число
+    рядов не зависит от значений параметров; запросы без маршрута
+    учитываются как `unmatched`.
+    """
+
+    # Запросы в обработке (общие для всех экземпляров в процессе)
+    in_flight = 0
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        MetricsMiddleware.in_flight += 1
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            MetricsMiddleware.in_flight -= 1
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(elapsed, (method, path))
+            http_requests.inc((method, path, str(status_code)))
@@ -0,0 +1,53 @@
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+
+# Максимальная длина одной строки NDJSON
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+async def read_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Разбить поток байтов на строки NDJSON
+
+    Возвращает пары (номер строки, строка); пустые строки пропускаются.
+    Вместо строки длиннее max_line_bytes возвращается None, а её остаток
+    отбрасывается, чтобы память не зависела от входных данных.
+    """
+    buffer = b""
+    line_no = 0
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n")
+            if end == -1:
+                break
+            line, buffer = buffer[:end], buffer[end + 1 :]
+            line_no += 1
+            if skipping:
+                skipping = False
+                yield line_no, None
+            elif line.strip():
+                yield line_no, line
+        if not skipping and len(buffer) > max_line_bytes:
+            skipping = True
+        if skipping:
+            buffer = b""
+    if skipping:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, buffer
+
+
+async def buffered(
+    lines: AsyncIterable[bytes], buffer_bytes: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """Склеить строки в блоки примерно по buffer_bytes для отправки"""
+    buffer = bytearray()
+    async for line in lines:
+        buffer += line
+        if len(buffer) >= buffer_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from uuid import UUID
+
+# Ключ keyset-пагинации: (created_at, id)
+CursorKey = Tuple[datetime, UUID]
+# Ключ пагинации результатов поиска: (rank, id)
+SearchCursorKey = Tuple[float, UUID]
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Закодировать позицию в непрозрачный курсор"""
+    return _encode([created_at.isoformat(), str(id)])
+
+
+def decode_cursor(cursor: str) -> CursorKey:
+    """Раскодировать курсор; ValueError, если курсор повреждён"""
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_search_cursor(rank: float, id: UUID) -> str:
+    """Закодировать позицию в результатах поиска"""
+    return _encode([rank, str(id)])
+
+
+def decode_search_cursor(cursor: str) -> SearchCursorKey:
+    """Раскодировать курсор поиска; ValueError, если курсор повреждён"""
+    try:
+        rank, id = _decode(cursor)
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise ValueError("Invalid rank")
+        return float(rank), UUID(id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Курсор следующей страницы; items запрашиваются с запасом limit + 1"""
+    if len(items) <= limit:
+        return None
+    last = items[limit - 1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,253 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+from dataclasses import dataclass
+from time import monotonic, time
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.cache import CacheBackend
+from src.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Cookie, после записи направляющая чтения клиента на primary
+STICKY_COOKIE = "read_primary_until"
+
+# Отставание реплики в секундах; 0, если все полученные WAL применены
+# (иначе у простаивающего primary отставание росло бы без записей)
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker
+    # До первой успешной проверки чтения идут на primary
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    checked: bool = False
+
+
+class ReplicaRouter:
+    """Выбор сессии для чтения: реплики по кругу или primary
+
+    Состояние реплик обновляется фоновой проверкой не чаще раза в
+    check_interval секунд, запускаемой самими запросами. Реплика
+    исключается, если проверка упала или отставание больше max_lag_seconds,
+    и сразу — при ошибке соединения во время запроса.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: List[Replica],
+        max_lag_seconds: float,
+        check_interval: float,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._checked_at = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+        for replica in replicas:
+            event.listen(
+                replica.engine.sync_engine, "handle_error", self._on_error(replica)
+            )
+
+    def sessionmaker(self, sticky: bool = False) -> async_sessionmaker:
+        if not self.replicas:
+            return self.primary
+        self._schedule_check()
+        if sticky:
+            return self.primary
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.primary
+        return healthy[next(self._counter) % len(healthy)].sessionmaker
+
+    def _schedule_check(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        if monotonic() - self._checked_at < self.check_interval:
+            return
+        self._checked_at = monotonic()
+        # Пустой контекст: запросы проверки не попадают в статистику HTTP-запроса
+        self._task = asyncio.get_running_loop().create_task(
+            self.check(), context=contextvars.Context()
+        )
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with replica.engine.connect() as conn:
+                    lag = float((await conn.execute(LAG_QUERY)).scalar_one())
+        except Exception as error:
+            if replica.healthy or not replica.checked:
+                logger.warning("Replica %s is unavailable: %r", replica.name, error)
+            replica.healthy = False
+            replica.lag_seconds = None
+            replica.checked = True
+            return
+        healthy = lag <= self.max_lag_seconds
+        if healthy != replica.healthy:
+            logger.warning(
+                "Replica %s is %s (lag %.1f s)",
+                replica.name,
+                "back in rotation" if healthy else "lagging",
+                lag,
+            )
+        replica.healthy = healthy
+        replica.lag_seconds = lag
+        replica.checked = True
+
+    @staticmethod
+    def _on_error(replica: Replica):
+        def handle_error(exception_context) -> None:
+            # Разрыв или ошибка подключения: не ждать следующей проверки
+            if exception_context.is_disconnect or exception_context.connection is None:
+                replica.healthy = False
+
+        return handle_error
+
+    async def dispose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def register_metrics(self) -> None:
+        registry.gauge(
+            "db_replica_healthy",
+            "1 if the replica receives reads",
+            ("replica",),
+            collect=lambda: {(r.name,): int(r.healthy) for r in self.replicas},
+        )
+        registry.gauge(
+            "db_replica_lag_seconds",
+            "Replica replay lag at the last check",
+            ("replica",),
+            collect=lambda: {
+                (r.name,): r.lag_seconds
+                for r in self.replicas
+                if r.lag_seconds is not None
+            },
+        )
+
+
+def reads_primary(request: Request) -> bool:
+    """Клиент недавно писал и должен читать свои записи с primary"""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+class WriteMarkers:
+    """Отметки «пользователь недавно писал», живущие window_seconds
+
+    Нужны клиентам, которые не хранят cookie (Bearer-токены): чтения
+    пользователя с отметкой идут на primary. С бэкендом redis отметки
+    общие для воркеров.
+    """
+
+    prefix = "wrote:"
+
+    def __init__(self, backend: CacheBackend, window_seconds: float):
+        self.backend = backend
+        self.window_seconds = window_seconds
+
+    async def mark(self, user_id: UUID) -> None:
+        await self.backend.set(f"{self.prefix}{user_id}", b"1", self.window_seconds)
+
+    async def recent(self, user_id: UUID) -> bool:
+        return await self.backend.get(f"{self.prefix}{user_id}") is not None
+
+
+class _Writes:
+    committed = False
+    user_id: Optional[UUID] = None
+
+
+_writes: contextvars.ContextVar[Optional[_Writes]] = contextvars.ContextVar(
+    "request_writes", default=None
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    # Чтения не коммитят, поэтому commit означает запись
+    writes = _writes.get()
+    if writes is not None:
+        writes.committed = True
+
+
+def remember_user(user_id: UUID) -> None:
+    """Запомнить пользователя запроса для отметки о записи"""
+    writes = _writes.get()
+    if writes is not None:
+        writes.user_id = user_id
+
+
+class ReadYourWritesMiddleware:
+    """Отмечает клиентов, чей запрос записал данные в БД
+
+    Ответу ставится cookie STICKY_COOKIE, а аутентифицированному
+    пользователю — отметка в markers. Пока действует что-то одно,
+    get_read_db отдаёт клиенту сессию primary, и клиент видит свои записи,
+    ещё не дошедшие до реплик.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int, markers: WriteMarkers):
+        self.app = app
+        self.window_seconds = window_seconds
+        self.markers = markers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = _Writes()
+        token = _writes.set(writes)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes.committed:
+                headers = MutableHeaders(scope=message)
+                window = self.window_seconds
+                headers.append(
+                    "Set-Cookie",
+                    f"{STICKY_COOKIE}={time() + window:.0f}; Max-Age={window}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+                # До отправки ответа: следующий запрос клиента уже увидит отметку
+                if writes.user_id is not None:
+                    await self.markers.mark(writes.user_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _writes.reset(token)
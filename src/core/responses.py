@@ -0,0 +1,83 @@
+import dataclasses
+import inspect
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.routing import APIRoute
+from fastapi.utils import is_body_allowed_for_status_code
+from pydantic import TypeAdapter, ValidationError
+
+from src.core.config import settings
+
+
+class FastResponseRoute(APIRoute):
+    """Маршрут, сериализующий ответ сразу в байты через pydantic-core
+
+    Стандартный APIRoute проверяет возвращённое значение по response_model,
+    затем кодирует его через jsonable_encoder и json.dumps. Здесь значение
+    валидируется не больше одного раза (готовые экземпляры схем
+    не перепроверяются) и сериализуется TypeAdapter.dump_json.
+
+    Статус и заголовки, выставленные через параметр `response: Response`,
+    не учитываются: такие эндпоинты должны возвращать Response сами.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        if (
+            self.response_field is None
+            or not isinstance(self.response_class, DefaultPlaceholder)
+            or not is_body_allowed_for_status_code(self.status_code)
+        ):
+            return super().get_route_handler()
+
+        original = self.dependant
+        # Эндпоинт вместе с сериализацией ответа; FastAPI отдаёт Response как есть
+        self.dependant = dataclasses.replace(
+            original, call=self._serializing(original.call)
+        )
+        try:
+            return super().get_route_handler()
+        finally:
+            self.dependant = original
+
+    def _serializing(self, call: Callable) -> Callable:
+        adapter = TypeAdapter(self.response_model)
+        status_code = self.status_code or 200
+        is_coroutine = inspect.iscoroutinefunction(call)
+        dump_options = {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+
+        async def endpoint(**values: Any) -> Response:
+            if is_coroutine:
+                content = await call(**values)
+            else:
+                content = await run_in_threadpool(call, **values)
+            if isinstance(content, Response):
+                return content
+
+            try:
+                content = adapter.validate_python(content, from_attributes=True)
+            except ValidationError as exc:
+                raise ResponseValidationError(
+                    exc.errors(include_url=False), body=content
+                ) from exc
+            return Response(
+                adapter.dump_json(content, **dump_options),
+                status_code=status_code,
+                media_type="application/json",
+            )
+
+        return endpoint
+
+
+# Класс маршрутов для роутеров из src/routes
+route_class = FastResponseRoute if settings.api_settings.fast_responses else APIRoute
@@ -1,5 +1,10 @@
+import asyncio
+import os
+from concurrent.futures import (Executor, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from time import perf_counter
+from typing import Callable, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,18 +15,126 @@ from src.core.config import settings as app_settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь на хеширование паролей переполнена"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is full")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Пул для bcrypt вне event loop с ограниченной очередью"""
+
+    def __init__(
+        self,
+        executor: str = "process",
+        workers: Optional[int] = None,
+        max_queue: int = 64,
+        retry_after_seconds: int = 1,
+    ):
+        self.executor_type = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: Optional[Executor] = None
+
+        # Метрики
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+        self.latency_seconds_total = 0.0
+        self.latency_seconds_max = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Количество задач, ожидающих свободного воркера"""
+        return max(0, self.pending - self.workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def _run(self, func: Callable, *args):
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusy(self.retry_after_seconds)
+
+        self.pending += 1
+        started = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            elapsed = perf_counter() - started
+            self.completed += 1
+            self.latency_seconds_total += elapsed
+            self.latency_seconds_max = max(self.latency_seconds_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Снимок метрик пула"""
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "latency_seconds_total": self.latency_seconds_total,
+            "latency_seconds_max": self.latency_seconds_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(**app_settings.password_hashing_settings.model_dump())
+
+
 class SecurityService:
     """Сервис для работы с JWT и паролями"""
 
     @staticmethod
     def hash_password(password: str) -> str:
         """Хеширует пароль"""
-        return pwd_context.hash(password)
+        return _hash_password(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Проверяет пароль"""
-        return pwd_context.verify(plain_password, hashed_password)
+        return _verify_password(plain_password, hashed_password)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Хеширует пароль в пуле, не блокируя event loop"""
+        return await password_hasher.hash(password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """Проверяет пароль в пуле, не блокируя event loop"""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @staticmethod
     def create_access_token(
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from src.core.config import settings
+
+single_flight_settings = settings.single_flight_settings
+
+
+class SingleFlight:
+    """Объединение одинаковых параллельных вызовов
+
+    Пока вызов по ключу выполняется, остальные вызовы с тем же ключом
+    ждут его результата (или исключения) вместо повторного выполнения.
+    Ведомый вызов ждёт не дольше timeout, после чего выполняет функцию сам.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+
+        # Метрики
+        self.calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._forget(key, task)
+        # Результат мог остаться никем не прочитанным, если все ждавшие отменены
+        if not task.cancelled():
+            task.exception()
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        self.calls += 1
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+            # Отмена запроса-инициатора не должна отменять вызов для ведомых
+            return await asyncio.shield(task)
+
+        self.coalesced += 1
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(task), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # Зависший вызов больше не принимает новых ведомых
+            self._forget(key, task)
+            return await func()
+
+    def stats(self) -> dict:
+        """Снимок метрик"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+        }
+
+
+# Чтения репозиториев
+single_flight = SingleFlight(timeout=single_flight_settings.timeout_seconds)
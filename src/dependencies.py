@@ -1,12 +1,19 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import get_db
+from src.core.cache import principal_cache
+from src.core.database import get_db, get_read_db
+from src.core.pagination import (CursorKey, SearchCursorKey, decode_cursor,
+                                 decode_search_cursor)
+from src.core.replicas import remember_user
 from src.core.security import security_service
+from src.repositories.loaders import Loaders
 from src.repositories.user import UserRepository
+from src.schemas.user import UserPrincipal
 
 security = HTTPBearer()
 
@@ -14,8 +21,13 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
-):
-    """Получить текущего аутентифицированного пользователя"""
+) -> UserPrincipal:
+    """Получить текущего аутентифицированного пользователя
+
+    Пользователь кешируется по user_id: подпись токена уже проверена,
+    а профиль от токена не зависит. Сессия запроса общая с эндпоинтом
+    и создаётся лениво, поэтому при попадании в кеш к БД не обращаемся.
+    """
     token = credentials.credentials
     user_id_str = security_service.decode_token(token)
     if not user_id_str:
@@ -31,11 +43,53 @@ async def get_current_user(
             detail="Неверный формат ID пользователя",
         )
 
-    user_repo = UserRepository(db)
-    user = await user_repo.get(user_id)
+    remember_user(user_id)
+    principal = await principal_cache.get(str(user_id))
+    if principal is not None:
+        return principal
+
+    user = await UserRepository(db).get(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден"
         )
 
-    return user
+    principal = UserPrincipal.model_validate(user)
+    await principal_cache.set(str(user_id), principal)
+    return principal
+
+
+def get_cursor(
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+) -> Optional[CursorKey]:
+    """Раскодировать курсор keyset-пагинации из query-параметра"""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Неверный курсор"
+        )
+
+
+def get_search_cursor(
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+) -> Optional[SearchCursorKey]:
+    """Раскодировать курсор пагинации результатов поиска"""
+    if cursor is None:
+        return None
+    try:
+        return decode_search_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Неверный курсор"
+        )
+
+
+def get_loaders(db: AsyncSession = Depends(get_read_db)) -> Loaders:
+    """Пакетные загрузчики, общие для всех зависимостей одного запроса
+
+    Читают с реплики, как и эндпоинты, которые их используют.
+    """
+    return Loaders(db)
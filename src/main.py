@@ -1,12 +1,30 @@
 import asyncio
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from src.core.cache import article_cache
 from src.core.config import settings
-from src.core.database import engine
+from src.core.database import engine, read_router, write_markers
+from src.core.instrumentation import QueryStatsMiddleware
+from src.core.metrics import MetricsMiddleware, registry
+from src.core.replicas import ReadYourWritesMiddleware
+from src.core.security import PasswordHasherBusy, password_hasher
 from src.routes import router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Вызывается после завершения запросов в обработке (graceful shutdown)
+    password_hasher.shutdown()
+    await article_cache.close()
+    await read_router.dispose()
+    await engine.dispose()
+
+
 # Инициализировать приложение
 app = FastAPI(
     title=settings.api_settings.api_title,
@@ -14,6 +32,7 @@ app = FastAPI(
     version=settings.api_settings.api_version,
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 
@@ -26,6 +45,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Учёт SQL-запросов на каждый HTTP-запрос (Server-Timing, N+1)
+app.add_middleware(QueryStatsMiddleware)
+
+# Чтения клиента с primary в течение окна после его записи
+if settings.database_settings.db_replica_urls:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.database_settings.db_read_your_writes_seconds,
+        markers=write_markers,
+    )
+
+# Метрики Prometheus: задержки и коды ответов по маршрутам
+if settings.metrics_settings.enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Сервер перегружен хешированием паролей"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервер перегружен, повторите запрос позже"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 
 # Роуты
 app.include_router(router)
@@ -37,6 +81,16 @@ def health_check():
     return {"status": "ok"}
 
 
+if settings.metrics_settings.enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Метрики в формате Prometheus"""
+        return PlainTextResponse(
+            registry.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,5 +1,6 @@
 from .article import Article
 from .comment import Comment
+from .tag import Tag
 from .user import User
 
-__all__ = ["Article", "Comment", "User"]
+__all__ = ["Article", "Comment", "Tag", "User"]
@@ -1,7 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (Column, Computed, DateTime, ForeignKey, Index, String,
+                        Text, func)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 from sqlalchemy.orm import relationship
 
 from src.core.database import Base
@@ -10,8 +11,20 @@ from src.core.database import Base
 class Article(Base):
 
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_created_at_id", "created_at", "id"),
+        Index("ix_articles_author_id_created_at_id", "author_id", "created_at", "id"),
+        Index(
+            "ix_articles_slug_pattern",
+            "slug",
+            postgresql_ops={"slug": "varchar_pattern_ops"},
+        ),
+        Index("ix_articles_tag_list", "tag_list", postgresql_using="gin"),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     slug = Column(String(255), unique=True, nullable=False, index=True)
     title = Column(String(255), nullable=False)
     description = Column(String(500), nullable=False)
@@ -19,11 +32,28 @@ class Article(Base):
     author_id = Column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    tag_list = Column(String(500), nullable=True)
+    # Счётчики в tags обновляют триггеры (функция articles_update_tag_counts)
+    tag_list = Column(ARRAY(String), nullable=False, server_default="{}")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Полнотекстовый индекс: заголовок (A), описание (B), текст (C).
+    # Колонка есть только в таблице (Article.__table__.c.search_vector):
+    # ORM её не загружает и не возвращает из INSERT/UPDATE ... RETURNING
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('russian', coalesce(body, '')), 'C')",
+            persisted=True,
+        ),
+    )
 
     author = relationship("User", back_populates="articles")
+    # Комментарии удаляет Postgres (ON DELETE CASCADE), ORM их не загружает
     comments = relationship(
-        "Comment", back_populates="article", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="article",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
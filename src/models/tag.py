@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String
+
+from src.core.database import Base
+
+
+class Tag(Base):
+    """Тег и число статей с ним (поддерживается триггером на articles)"""
+
+    __tablename__ = "tags"
+
+    name = Column(String, primary_key=True)
+    articles_count = Column(Integer, nullable=False, server_default="0", index=True)
@@ -11,7 +11,7 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     username = Column(String(255), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
@@ -20,9 +20,17 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Статьи и комментарии удаляет Postgres (ON DELETE CASCADE),
+    # ORM их не загружает
     articles = relationship(
-        "Article", back_populates="author", cascade="all, delete-orphan"
+        "Article",
+        back_populates="author",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     comments = relationship(
-        "Comment", back_populates="author", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="author",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
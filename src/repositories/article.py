@@ -1,52 +1,303 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import (Any, AsyncIterator, Dict, List, Optional, Sequence, Set,
+                    Tuple)
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (Integer, Row, Select, and_, case, cast, func, literal,
+                        literal_column, or_, select, true, tuple_)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.pagination import CursorKey, SearchCursorKey
 from src.models.article import Article
 from src.repositories.base import BaseRepository
-from src.schemas.article import ArticleCreate, ArticleUpdate
+from src.schemas.article import ArticleCreate, ArticleUpdateDB
 
+# Конфигурация полнотекстового поиска (совпадает с search_vector в миграции)
+SEARCH_CONFIG = "russian"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15"
 
-class ArticleRepository(BaseRepository[Article, ArticleCreate, ArticleUpdate]):
+# Slug, совпадающие с маршрутами /api/articles/<слово>: статья с таким slug
+# была бы недоступна по GET /api/articles/{slug}, поэтому они считаются занятыми
+RESERVED_SLUGS = frozenset({"export", "search"})
+
+
+class ArticleRepository(BaseRepository[Article, ArticleCreate, ArticleUpdateDB]):
     """Репозиторий для работы со статьями"""
 
+    # Уникальный индекс по slug (имя ограничения в IntegrityError)
+    slug_index = "ix_articles_slug"
+
+    # Колонки для списков: всё, кроме body
+    summary_columns = (
+        Article.id,
+        Article.slug,
+        Article.title,
+        Article.description,
+        Article.tag_list,
+        Article.author_id,
+        Article.created_at,
+        Article.updated_at,
+    )
+
+    # Колонки для выгрузки: всё, кроме search_vector
+    export_columns = summary_columns + (Article.body,)
+
     def __init__(self, db: AsyncSession):
         super().__init__(db, Article)
 
     async def get_by_slug(
-        self, slug: str, load_author: bool = False, load_comments: bool = False
+        self,
+        slug: str,
+        load_author: bool = False,
+        load_comments: bool = False,
+        shared: bool = False,
     ) -> Optional[Article]:
-        """Получить статью по slug"""
+        """Получить статью по slug
+
+        shared=True объединяет одновременные чтения той же статьи (только
+        для чтения: объект общий и не привязан к сессии).
+        """
         stmt = select(Article).where(Article.slug == slug)
         if load_author:
             stmt = stmt.options(selectinload(Article.author))
         if load_comments:
             stmt = stmt.options(selectinload(Article.comments))
+        return await self._read(
+            stmt,
+            lambda result: result.scalar_one_or_none(),
+            ("by_slug", slug, load_author, load_comments) if shared else None,
+        )
+
+    @staticmethod
+    def _with_tag(stmt: Select, tag: Optional[str]) -> Select:
+        """Отфильтровать по тегу (tag_list @> ARRAY[tag], GIN-индекс)"""
+        if tag is None:
+            return stmt
+        return stmt.where(Article.tag_list.contains([tag]))
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, tag: Optional[str] = None
+    ) -> List[Article]:
+        """Получить все статьи с пагинацией"""
+        stmt = self._ordered(self._with_tag(select(Article), tag))
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def get_page(
+        self,
+        after: Optional[CursorKey] = None,
+        limit: int = 100,
+        tag: Optional[str] = None,
+    ) -> List[Article]:
+        """Получить страницу статей (новые первыми)"""
+        stmt = self._after(self._with_tag(select(Article), tag), after)
+        result = await self.db.execute(stmt.limit(limit))
+        return list(result.scalars().all())
+
+    async def get_summaries(
+        self, skip: int = 0, limit: int = 100, tag: Optional[str] = None
+    ) -> List[Row]:
+        """Получить краткие строки статей (без body) с пагинацией"""
+        stmt = self._ordered(self._with_tag(select(*self.summary_columns), tag))
+        result = await self.db.execute(stmt.offset(skip).limit(limit))
+        return list(result.all())
+
+    async def get_summaries_page(
+        self,
+        after: Optional[CursorKey] = None,
+        limit: int = 100,
+        tag: Optional[str] = None,
+    ) -> List[Row]:
+        """Получить страницу кратких строк статей (без body)"""
+        stmt = self._after(self._with_tag(select(*self.summary_columns), tag), after)
+        result = await self.db.execute(stmt.limit(limit))
+        return list(result.all())
+
+    async def get_summaries_by_ids(self, ids: Sequence[UUID]) -> List[Row]:
+        """Краткие строки статей по списку id одним запросом (порядок любой)"""
+        if not ids:
+            return []
+        stmt = select(*self.summary_columns).where(self._any(Article.id, ids))
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        return list(result.all())
+
+    async def get_summaries_by_slugs(self, slugs: Sequence[str]) -> List[Row]:
+        """Краткие строки статей по списку slug одним запросом (порядок любой)"""
+        if not slugs:
+            return []
+        stmt = select(*self.summary_columns).where(self._any(Article.slug, slugs))
+        result = await self.db.execute(stmt)
+        return list(result.all())
+
+    async def stream_for_export(
+        self,
+        after: Optional[CursorKey] = None,
+        author_id: Optional[UUID] = None,
+        tag: Optional[str] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Row]:
+        """Строки статей для выгрузки в порядке (created_at, id)
+
+        Читаются через серверный курсор пачками по batch_size, поэтому
+        память не зависит от объёма выгрузки.
+        """
+        stmt = self._after(
+            self._with_tag(select(*self.export_columns), tag), after, descending=False
+        )
+        if author_id is not None:
+            stmt = stmt.where(Article.author_id == author_id)
+        stmt = self._updated_between(stmt, updated_from, updated_to)
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
+
+    async def search(
+        self,
+        query: str,
+        after: Optional[SearchCursorKey] = None,
+        limit: int = 20,
+    ) -> List[Row]:
+        """Полнотекстовый поиск с ранжированием и фрагментами текста
+
+        Ранжирование идёт только по search_vector совпавших строк (GIN-индекс),
+        body читается лишь для статей страницы — ради ts_headline.
+        """
+        search_vector = Article.__table__.c.search_vector
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, query)
+        rank = func.ts_rank_cd(search_vector, tsquery)
+
+        hits = select(Article.id, rank.label("rank")).where(
+            search_vector.op("@@")(tsquery)
+        )
+        if after is not None:
+            hits = hits.where(tuple_(rank, Article.id) < tuple_(*after))
+        hits = (
+            hits.order_by(rank.desc(), Article.id.desc()).limit(limit).subquery("hits")
+        )
+
+        stmt = (
+            select(
+                *self.summary_columns,
+                hits.c.rank,
+                func.ts_headline(config, Article.body, tsquery, HEADLINE_OPTIONS).label(
+                    "headline"
+                ),
+            )
+            .join(hits, hits.c.id == Article.id)
+            .order_by(hits.c.rank.desc(), hits.c.id.desc())
+        )
+        result = await self.db.execute(stmt)
+        return list(result.all())
 
     async def get_by_author_id(
         self, author_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Article]:
         """Получить все статьи автора"""
         stmt = (
-            select(Article)
-            .where(Article.author_id == author_id)
+            self._ordered(select(Article).where(Article.author_id == author_id))
             .offset(skip)
             .limit(limit)
         )
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
-    async def check_slug_exists(
-        self, slug: str, exclude_id: Optional[UUID] = None
-    ) -> bool:
-        """Проверить, существует ли slug"""
-        stmt = select(Article).where(Article.slug == slug)
+    @staticmethod
+    def _slug_usage(base_slug: Any) -> Tuple[Any, Any]:
+        """Агрегаты (base_slug занят, max N среди base_slug-N)"""
+        suffix = func.substr(Article.slug, func.length(base_slug) + 2)
+        taken = func.bool_or(Article.slug == base_slug)
+        max_suffix = func.max(
+            case(
+                (suffix.regexp_match("^[0-9]{1,9}$"), cast(suffix, Integer)),
+            )
+        )
+        # Побайтовый диапазон [base-, base.) вместо LIKE 'base-%':
+        # операторы ~>=~ / ~<~ используют индекс и в generic-плане
+        criteria = or_(
+            Article.slug == base_slug,
+            and_(
+                Article.slug.op("~>=~")((base_slug + "-").self_group()),
+                Article.slug.op("~<~")((base_slug + ".").self_group()),
+            ),
+        )
+        return select(taken, max_suffix).where(criteria)
+
+    async def next_free_slug(
+        self, base_slug: str, exclude_id: Optional[UUID] = None
+    ) -> str:
+        """Подобрать свободный slug одним запросом
+
+        Смотрит на base_slug и его варианты base_slug-N (скан по префиксу
+        через ix_articles_slug_pattern) и возвращает base_slug, если он
+        свободен, иначе base_slug-(max(N) + 1). Гонку с параллельной вставкой
+        того же slug разрешает вызывающий код повтором при IntegrityError.
+        """
+        stmt = self._slug_usage(literal(base_slug, Article.slug.type))
         if exclude_id:
             stmt = stmt.where(Article.id != exclude_id)
         result = await self.db.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        base_taken, max_suffix = result.one()
+        if not base_taken and base_slug not in RESERVED_SLUGS:
+            return base_slug
+        return f"{base_slug}-{(max_suffix or 0) + 1}"
+
+    async def allocate_slugs(self, base_slugs: Sequence[str]) -> List[str]:
+        """Подобрать свободные slug для пачки статей одним запросом
+
+        Для каждой различной основы выполняется тот же поиск, что и в
+        next_free_slug (LATERAL по unnest), повторы внутри пачки получают
+        следующие номера. Гонку с параллельной вставкой разрешает
+        вызывающий код.
+        """
+        distinct = list(dict.fromkeys(base_slugs))
+        bases = (
+            func.unnest(literal(distinct, ARRAY(Article.slug.type)))
+            .table_valued("base")
+            .render_derived(name="bases")
+        )
+        usage = self._slug_usage(bases.c.base).lateral("usage")
+        stmt = select(bases.c.base, *usage.c).select_from(bases.join(usage, true()))
+        result = await self.db.execute(stmt)
+        state: Dict[str, Tuple[bool, int]] = {
+            base: (bool(taken) or base in RESERVED_SLUGS, max_suffix or 0)
+            for base, taken, max_suffix in result
+        }
+
+        slugs = []
+        for base in base_slugs:
+            taken, max_suffix = state[base]
+            if not taken:
+                slugs.append(base)
+                state[base] = (True, max_suffix)
+            else:
+                slugs.append(f"{base}-{max_suffix + 1}")
+                state[base] = (True, max_suffix + 1)
+        return slugs
+
+    async def insert_many(self, rows: Sequence[Dict[str, Any]]) -> Set[str]:
+        """Вставить статьи одним multi-row INSERT
+
+        Строки с уже занятым slug пропускаются (ON CONFLICT DO NOTHING);
+        возвращает slug вставленных статей. При другой ошибке БД
+        транзакция откатывается и ошибка пробрасывается.
+        """
+        stmt = (
+            pg_insert(Article)
+            .values(list(rows))
+            .on_conflict_do_nothing(index_elements=[Article.slug])
+            .returning(Article.slug)
+        )
+        try:
+            result = await self.db.execute(stmt)
+            inserted = set(result.scalars().all())
+        except DBAPIError:
+            await self.db.rollback()
+            raise
+        return inserted
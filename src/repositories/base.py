@@ -1,17 +1,37 @@
-from typing import Generic, List, Optional, Type, TypeVar
+from datetime import datetime
+from typing import (Any, Callable, Dict, Generic, Hashable, List, Optional,
+                    Sequence, Type, TypeVar)
 from uuid import UUID
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (ColumnElement, Result, Select, any_, delete, func,
+                        insert, literal, select, tuple_, update)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.pagination import CursorKey
+from src.core.singleflight import single_flight, single_flight_settings
+
 T = TypeVar("T")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def is_unique_violation(exc: IntegrityError, constraint: str) -> bool:
+    """Проверить, что ошибка — нарушение указанного уникального ограничения"""
+    # asyncpg-исключение лежит в __cause__ обёртки DBAPI
+    cause = getattr(exc.orig, "__cause__", None)
+    return getattr(cause, "constraint_name", None) == constraint
+
+
 class BaseRepository(Generic[T, CreateSchemaType, UpdateSchemaType]):
-    """Базовый репозиторий с асинхронными CRUD операциями"""
+    """Базовый репозиторий с асинхронными CRUD операциями
+
+    Методы записи не коммитят: изменения фиксирует вызывающий одним
+    commit() в конце операции (см. UnitOfWork). Ошибка целостности
+    откатывает всю транзакцию сессии.
+    """
 
     def __init__(self, db: AsyncSession, model: Type[T]):
         self.db = db
@@ -23,37 +43,157 @@ class BaseRepository(Generic[T, CreateSchemaType, UpdateSchemaType]):
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _any(column: Any, values: Sequence) -> ColumnElement:
+        """column = ANY(:values): один параметр-массив вместо IN (...)
+
+        Текст запроса не зависит от числа значений, поэтому подготовленный
+        запрос переиспользуется для списков любой длины.
+        """
+        return column == any_(literal(list(values), ARRAY(column.type)))
+
+    async def get_many(self, ids: Sequence[UUID]) -> List[T]:
+        """Получить несколько объектов по ID одним запросом (порядок любой)"""
+        if not ids:
+            return []
+        stmt = select(self.model).where(self._any(self.model.id, ids))
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def _read(
+        self,
+        stmt: Select,
+        fetch: Callable[[Result], Any],
+        shared_key: Optional[Hashable] = None,
+    ) -> Any:
+        """Выполнить чтение
+
+        С shared_key одинаковые параллельные чтения объединяются в один запрос
+        в отдельной сессии. Результат общий для всех ждавших и отсоединён
+        от сессии, поэтому его можно только читать. Чтения с разных БД
+        (primary и реплики) не объединяются: иначе чтение клиента, который
+        должен видеть свою запись, могло бы получить результат с реплики.
+        """
+        if shared_key is None or not single_flight_settings.enabled:
+            return fetch(await self.db.execute(stmt))
+
+        bind = self.db.bind
+
+        async def load() -> Any:
+            async with AsyncSession(bind, expire_on_commit=False) as session:
+                return fetch(await session.execute(stmt))
+
+        key = (self.model.__name__, bind.url, shared_key)
+        return await single_flight.do(key, load)
+
+    def _ordered(self, stmt: Select, descending: bool = True) -> Select:
+        """Упорядочить по ключу пагинации (created_at, id)"""
+        if descending:
+            return stmt.order_by(self.model.created_at.desc(), self.model.id.desc())
+        return stmt.order_by(self.model.created_at.asc(), self.model.id.asc())
+
+    def _after(
+        self, stmt: Select, after: Optional[CursorKey], descending: bool = True
+    ) -> Select:
+        """Ограничить выборку записями после позиции курсора"""
+        stmt = self._ordered(stmt, descending)
+        if after is None:
+            return stmt
+        key = tuple_(self.model.created_at, self.model.id)
+        # Типы колонок, иначе created_at привязывается как timestamp без зоны
+        position = tuple_(
+            literal(after[0], self.model.created_at.type),
+            literal(after[1], self.model.id.type),
+        )
+        return stmt.where(key < position if descending else key > position)
+
+    def _updated_between(
+        self,
+        stmt: Select,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+    ) -> Select:
+        """Ограничить по времени последнего изменения (created_at, если не было)"""
+        changed_at = func.coalesce(self.model.updated_at, self.model.created_at)
+        if updated_from is not None:
+            stmt = stmt.where(changed_at >= updated_from)
+        if updated_to is not None:
+            stmt = stmt.where(changed_at < updated_to)
+        return stmt
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Получить все с пагинацией"""
-        stmt = select(self.model).offset(skip).limit(limit)
+        stmt = self._ordered(select(self.model)).offset(skip).limit(limit)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_page(
+        self, after: Optional[CursorKey] = None, limit: int = 100
+    ) -> List[T]:
+        """Получить страницу keyset-пагинации (новые записи первыми)"""
+        stmt = self._after(select(self.model), after).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def _insert(self, values: Dict[str, Any]) -> T:
+        """INSERT ... RETURNING: объект с серверными значениями за один запрос"""
+        stmt = insert(self.model).values(**values).returning(self.model)
+        try:
+            result = await self.db.execute(stmt)
+            db_obj = result.scalar_one()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        return db_obj
+
     async def create(self, obj_in: CreateSchemaType) -> T:
         """Создать новый объект"""
-        db_obj = self.model(**obj_in.model_dump())
-        self.db.add(db_obj)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
-        return db_obj
+        return await self._insert(obj_in.model_dump())
 
     async def update(self, db_obj: T, obj_in: UpdateSchemaType) -> T:
         """Обновить объект"""
+        if not obj_in.model_dump(exclude_unset=True):
+            return db_obj
+        return await self.update_by_id(db_obj.id, obj_in)
+
+    async def update_by_id(self, id: UUID, obj_in: UpdateSchemaType) -> Optional[T]:
+        """Обновить по ID (UPDATE ... RETURNING), None — если объекта нет"""
         obj_data = obj_in.model_dump(exclude_unset=True)
-        for field, value in obj_data.items():
-            setattr(db_obj, field, value)
-        self.db.add(db_obj)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
+        if not obj_data:
+            return await self.get(id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**obj_data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.db.execute(stmt)
+            db_obj = result.scalar_one_or_none()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
         return db_obj
 
     async def delete(self, id: UUID) -> bool:
         """Удалить по ID"""
-        stmt = select(self.model).where(self.model.id == id)
+        stmt = delete(self.model).where(self.model.id == id).returning(self.model.id)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def delete_many(self, ids: Sequence[UUID]) -> int:
+        """Удалить несколько объектов одним запросом
+
+        Связанные строки удаляет Postgres через ON DELETE CASCADE,
+        в память они не загружаются.
+        """
+        if not ids:
+            return 0
+        stmt = (
+            delete(self.model)
+            .where(self._any(self.model.id, ids))
+            .execution_options(synchronize_session=False)
+        )
         result = await self.db.execute(stmt)
-        db_obj = result.scalar_one_or_none()
-        if db_obj:
-            await self.db.delete(db_obj)
-            await self.db.commit()
-            return True
-        return False
+        return result.rowcount
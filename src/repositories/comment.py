@@ -1,9 +1,15 @@
-from typing import List, Optional
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (Result, Row, Select, and_, delete, insert, literal,
+                        select, true)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from src.core.pagination import CursorKey
+from src.models.article import Article
 from src.models.comment import Comment
 from src.repositories.base import BaseRepository
 from src.schemas.comment import CommentCreate
@@ -15,25 +21,144 @@ class CommentRepository(BaseRepository[Comment, CommentCreate, CommentCreate]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, Comment)
 
-    async def get_by_article_id(
-        self, article_id: UUID, skip: int = 0, limit: int = 100
-    ) -> List[Comment]:
-        """Получить все комментарии статьи"""
-        stmt = (
-            select(Comment)
-            .where(Comment.article_id == article_id)
-            .offset(skip)
-            .limit(limit)
+    @staticmethod
+    def _with_article_slug(slug: str, comments: Select) -> Select:
+        """id статьи по slug и её комментарии из comments (LEFT JOIN LATERAL)
+
+        Если статьи нет, строк нет; если у статьи нет комментариев, будет
+        одна строка с comment = None.
+        """
+        lateral = comments.where(Comment.article_id == Article.id).lateral()
+        comment = aliased(Comment, lateral)
+        return (
+            select(Article.id, comment)
+            .outerjoin(lateral, true())
+            .where(Article.slug == slug)
+            .order_by(comment.created_at.asc(), comment.id.asc())
+        )
+
+    @staticmethod
+    def _article_with_comments(
+        result: Result,
+    ) -> Optional[Tuple[UUID, List[Comment]]]:
+        rows = result.all()
+        if not rows:
+            return None
+        return rows[0][0], [row[1] for row in rows if row[1] is not None]
+
+    async def get_by_article_slug(
+        self, slug: str, skip: int = 0, limit: int = 100, shared: bool = False
+    ) -> Optional[Tuple[UUID, List[Comment]]]:
+        """Получить id статьи и её комментарии одним запросом; None — статьи нет"""
+        comments = (
+            self._ordered(select(Comment), descending=False).offset(skip).limit(limit)
+        )
+        return await self._read(
+            self._with_article_slug(slug, comments),
+            self._article_with_comments,
+            ("by_article_slug", slug, skip, limit) if shared else None,
+        )
+
+    async def get_page_by_article_slug(
+        self,
+        slug: str,
+        after: Optional[CursorKey] = None,
+        limit: int = 100,
+        shared: bool = False,
+    ) -> Optional[Tuple[UUID, List[Comment]]]:
+        """Получить id статьи и страницу её комментариев одним запросом"""
+        comments = self._after(select(Comment), after, descending=False).limit(limit)
+        return await self._read(
+            self._with_article_slug(slug, comments),
+            self._article_with_comments,
+            ("page_by_article_slug", slug, after, limit) if shared else None,
         )
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
 
-    async def get_by_article_and_comment_id(
-        self, article_id: UUID, comment_id: UUID
+    async def create_for_article_slug(
+        self, slug: str, body: str, author_id: UUID
     ) -> Optional[Comment]:
-        """Получить комментарий статьи по ID"""
-        stmt = select(Comment).where(
-            Comment.article_id == article_id, Comment.id == comment_id
+        """Создать комментарий к статье по slug (INSERT ... SELECT)
+
+        None — статьи с таким slug нет.
+        """
+        source = select(
+            literal(uuid.uuid4(), Comment.id.type),
+            literal(body, Comment.body.type),
+            Article.id,
+            literal(author_id, Comment.author_id.type),
+        ).where(Article.slug == slug)
+        stmt = (
+            insert(Comment)
+            .from_select(["id", "body", "article_id", "author_id"], source)
+            .returning(Comment)
         )
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def delete_by_article_slug(
+        self, slug: str, comment_id: UUID, author_id: UUID
+    ) -> bool:
+        """Удалить комментарий автора у статьи по slug (DELETE ... USING)
+
+        False — статьи, комментария нет или комментарий чужой; причину
+        возвращает get_author_by_article_slug.
+        """
+        stmt = (
+            delete(Comment)
+            .where(
+                Comment.id == comment_id,
+                Comment.article_id == Article.id,
+                Article.slug == slug,
+                Comment.author_id == author_id,
+            )
+            .returning(Comment.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none() is not None
+
+    async def get_author_by_article_slug(
+        self, slug: str, comment_id: UUID
+    ) -> Optional[Row]:
+        """(article_id, author_id) комментария статьи по slug
+
+        None — статьи нет; author_id = None — у статьи нет такого комментария.
+        """
+        stmt = (
+            select(Article.id.label("article_id"), Comment.author_id)
+            .outerjoin(
+                Comment,
+                and_(Comment.article_id == Article.id, Comment.id == comment_id),
+            )
+            .where(Article.slug == slug)
+        )
+        result = await self.db.execute(stmt)
+        return result.one_or_none()
+
+    async def stream_for_export(
+        self,
+        after: Optional[CursorKey] = None,
+        author_id: Optional[UUID] = None,
+        tag: Optional[str] = None,
+        updated_from: Optional[datetime] = None,
+        updated_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Row]:
+        """Строки комментариев для выгрузки в порядке (created_at, id)
+
+        tag отбирает комментарии к статьям с этим тегом. Читаются через
+        серверный курсор пачками по batch_size.
+        """
+        stmt = self._after(select(*Comment.__table__.c), after, descending=False)
+        if author_id is not None:
+            stmt = stmt.where(Comment.author_id == author_id)
+        if tag is not None:
+            stmt = stmt.where(
+                Comment.article_id.in_(
+                    select(Article.id).where(Article.tag_list.contains([tag]))
+                )
+            )
+        stmt = self._updated_between(stmt, updated_from, updated_to)
+        result = await self.db.stream(stmt.execution_options(yield_per=batch_size))
+        async for row in result:
+            yield row
@@ -0,0 +1,68 @@
+import asyncio
+from typing import Dict, List, Sequence, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dataloader import DataLoader
+from src.models.user import User
+from src.repositories.article import ArticleRepository
+from src.repositories.user import UserRepository
+from src.schemas.user import UserProfile
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class Loaders:
+    """Пакетные загрузчики поверх сессии одного запроса
+
+    Загрузчики делят сессию, поэтому их запросы выполняются по очереди:
+    AsyncSession не допускает параллельных операций.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.user_repo = UserRepository(db)
+        self.article_repo = ArticleRepository(db)
+        self._lock = asyncio.Lock()
+
+        self.users: DataLoader[UUID, User] = DataLoader(self._load_users)
+        self.articles: DataLoader[UUID, Row] = DataLoader(self._load_articles)
+        self.articles_by_slug: DataLoader[str, Row] = DataLoader(
+            self._load_articles_by_slug
+        )
+
+    async def with_authors(
+        self, items: Sequence[BaseModel], schema: Type[M]
+    ) -> List[M]:
+        """Копии элементов в схеме schema с профилями авторов
+
+        Авторы всех элементов читаются одним запросом (уже загруженные
+        за этот запрос — не читаются вовсе).
+        """
+        author_ids = list(
+            dict.fromkeys(item.author_id for item in items if item.author_id)
+        )
+        users = await self.users.load_many(author_ids)
+        profiles = {user.id: UserProfile.model_validate(user) for user in users if user}
+        # Элементы уже провалидированы, повторная валидация не нужна
+        return [
+            schema.model_construct(**dict(item), author=profiles.get(item.author_id))
+            for item in items
+        ]
+
+    async def _load_users(self, ids: List[UUID]) -> Dict[UUID, User]:
+        async with self._lock:
+            users = await self.user_repo.get_many(ids)
+        return {user.id: user for user in users}
+
+    async def _load_articles(self, ids: List[UUID]) -> Dict[UUID, Row]:
+        async with self._lock:
+            rows = await self.article_repo.get_summaries_by_ids(ids)
+        return {row.id: row for row in rows}
+
+    async def _load_articles_by_slug(self, slugs: List[str]) -> Dict[str, Row]:
+        async with self._lock:
+            rows = await self.article_repo.get_summaries_by_slugs(slugs)
+        return {row.slug: row for row in rows}
@@ -0,0 +1,24 @@
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.tag import Tag
+
+
+class TagRepository:
+    """Репозиторий для чтения тегов и их счётчиков"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_popular(self, limit: int = 100) -> List[Tag]:
+        """Получить самые популярные теги"""
+        stmt = (
+            select(Tag)
+            .where(Tag.articles_count > 0)
+            .order_by(Tag.articles_count.desc(), Tag.name)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
@@ -26,19 +26,17 @@ class UserRepository(BaseRepository[User, UserCreate, UserUpdate]):
 
     async def create_with_password(self, user_in: UserCreate) -> User:
         user_data = user_in.model_dump()
-        user_data["hashed_password"] = security_service.hash_password(
+        user_data["hashed_password"] = await security_service.hash_password_async(
             user_data.pop("password")
         )
-        db_obj = User(**user_data)
-        self.db.add(db_obj)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
-        return db_obj
+        return await self._insert(user_data)
 
     async def authenticate(self, email: str, password: str) -> Optional[User]:
         user = await self.get_by_email(email)
         if not user:
             return None
-        if not security_service.verify_password(password, user.hashed_password):
+        if not await security_service.verify_password_async(
+            password, user.hashed_password
+        ):
             return None
         return user
@@ -1,6 +1,7 @@
 from .articles import router as articles_router
 from .users import router as users_router
 from .comments import router as comments_router
+from .tags import router as tags_router
 
 from fastapi import APIRouter
 
@@ -8,5 +9,6 @@ router = APIRouter()
 router.include_router(articles_router)
 router.include_router(users_router)
 router.include_router(comments_router)
+router.include_router(tags_router)
 
 __all__ = ["router"]
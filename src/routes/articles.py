@@ -1,21 +1,38 @@
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional, Union
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import (APIRouter, Depends, Header, Query, Request, Response,
+                     status)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.controllers.article import ArticleController
-from src.core.database import get_db
-from src.dependencies import get_current_user
-from src.models.user import User
-from src.schemas.article import ArticleBase, ArticleResponse, ArticleUpdate
+from src.controllers.article import IMPORT_MAX_CHUNK_SIZE, ArticleController
+from src.controllers.export import ExportResource, export_lines
+from src.core.cache import etag_matches
+from src.core.database import get_db, get_read_db
+from src.core.ndjson import buffered, read_lines
+from src.core.pagination import CursorKey, SearchCursorKey
+from src.core.responses import route_class
+from src.dependencies import (get_current_user, get_cursor, get_loaders,
+                              get_search_cursor)
+from src.repositories.loaders import Loaders
+from src.schemas.article import (ArticleBase, ArticleBatchRequest,
+                                 ArticleImportReport, ArticleResponse,
+                                 ArticleSearchHit, ArticleSummaryResponse,
+                                 ArticleSummaryWithAuthor, ArticleUpdate,
+                                 ArticleWithAuthor)
+from src.schemas.batch import Batch
+from src.schemas.pagination import Page
+from src.schemas.user import UserPrincipal
 
-router = APIRouter(prefix="/api/articles", tags=["articles"])
+router = APIRouter(prefix="/api/articles", tags=["articles"], route_class=route_class)
 
 
 @router.post("/", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
 async def create_article(
     article_in: ArticleBase,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Создать новую статью"""
@@ -23,30 +40,187 @@ async def create_article(
     return await controller.create_article(article_in, current_user.id)
 
 
-@router.get("/", response_model=List[ArticleResponse])
+@router.get(
+    "/",
+    response_model=Union[
+        List[ArticleResponse],
+        List[ArticleSummaryResponse],
+        List[ArticleWithAuthor],
+        List[ArticleSummaryWithAuthor],
+        Page[ArticleResponse],
+        Page[ArticleSummaryResponse],
+        Page[ArticleWithAuthor],
+        Page[ArticleSummaryWithAuthor],
+    ],
+)
 async def get_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    pagination: Literal["offset", "cursor"] = Query("offset"),
+    fields: Literal["full", "summary"] = Query("full"),
+    tag: Optional[str] = Query(None, description="Только статьи с этим тегом"),
+    include: Optional[Literal["author"]] = Query(
+        None, description="Встроить профили авторов"
+    ),
+    after: Optional[CursorKey] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """Получить список всех статей
+
+    С `pagination=cursor` (или с переданным `cursor`) возвращает страницу
+    с `next_cursor` вместо списка. С `fields=summary` статьи отдаются без `body`,
+    с `tag` — только статьи с этим тегом. С `include=author` у каждой статьи
+    есть `author` — профиль автора; авторы читаются одним запросом.
+    """
+    controller = ArticleController(db)
+    author_loaders = loaders if include == "author" else None
+    cursor_mode = pagination == "cursor" or after is not None
+    if fields == "summary":
+        if cursor_mode:
+            return await controller.get_article_summaries_page(
+                after, limit, tag, author_loaders
+            )
+        return await controller.get_article_summaries(skip, limit, tag, author_loaders)
+    if cursor_mode:
+        return await controller.get_articles_page(after, limit, tag, author_loaders)
+    return await controller.get_all_articles(skip, limit, tag, author_loaders)
+
+
+@router.post("/batch", response_model=Batch[ArticleSummaryResponse, Union[UUID, str]])
+async def get_articles_batch(
+    batch: ArticleBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """Краткие данные статей (без `body`) по списку `ids` или `slugs`
+
+    Все статьи читаются одним запросом, повторные ключи — один раз.
+    `items` идут в порядке запроса, на месте ненайденных — `null`,
+    ненайденные ключи перечислены в `missing`.
+    """
+    controller = ArticleController(db)
+    return await controller.get_articles_batch(batch, loaders)
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_articles_batch(
+    batch: ArticleBatchRequest,
+    current_user: UserPrincipal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Удалить статьи по списку `ids` или `slugs`
+
+    Статьи удаляются одним запросом, комментарии — каскадом в Postgres.
+    Удаляются все статьи или ни одной: ненайденные ключи дают 404
+    со списком `missing`, чужие статьи — 403.
+    """
+    controller = ArticleController(db)
+    await controller.delete_articles(batch, current_user.id)
+    return None
+
+
+@router.post("/import", response_model=ArticleImportReport)
+async def import_articles(
+    request: Request,
+    chunk_size: int = Query(1000, ge=1, le=IMPORT_MAX_CHUNK_SIZE),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Получить список всех статей"""
+    """Массовый импорт статей из NDJSON
+
+    Тело запроса — по одному JSON-объекту статьи (как в `POST /api/articles/`)
+    на строку; читается потоком. Автор всех статей — текущий пользователь.
+    Возвращает число импортированных строк, ошибки по номерам строк
+    и скорость импорта.
+    """
+    controller = ArticleController(db)
+    return await controller.import_articles(
+        read_lines(request.stream()), current_user.id, chunk_size
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export(
+    resource: ExportResource = Query("articles"),
+    author_id: Optional[UUID] = Query(None, description="Только записи автора"),
+    tag: Optional[str] = Query(
+        None, description="Только статьи с тегом и комментарии к ним"
+    ),
+    updated_from: Optional[datetime] = Query(None, description="Изменены не раньше"),
+    updated_to: Optional[datetime] = Query(None, description="Изменены раньше"),
+    after: Optional[CursorKey] = Depends(get_cursor),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Выгрузить статьи или комментарии в NDJSON
+
+    Каждая строка — `{"cursor": ..., "article": {...}}` (или `"comment"`),
+    в порядке создания. Чтобы продолжить прерванную выгрузку, передайте
+    `cursor` последней полученной строки с теми же фильтрами.
+    Время изменения — `updated_at`, а для неизменённых записей `created_at`.
+    """
+    lines = export_lines(resource, after, author_id, tag, updated_from, updated_to)
+    return StreamingResponse(buffered(lines), media_type="application/x-ndjson")
+
+
+@router.get("/search", response_model=Page[ArticleSearchHit])
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=256, description="Поисковый запрос"),
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[SearchCursorKey] = Depends(get_search_cursor),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Полнотекстовый поиск по заголовку, описанию и тексту статей
+
+    Результаты упорядочены по релевантности, `headline` содержит фрагмент
+    текста с совпадениями в `<mark>`.
+    """
     controller = ArticleController(db)
-    return await controller.get_all_articles(skip, limit)
+    return await controller.search_articles(q, after, limit)
 
 
-@router.get("/{slug}", response_model=ArticleResponse)
-async def get_article(slug: str, db: AsyncSession = Depends(get_db)):
-    """Получить статью по slug"""
+@router.get(
+    "/{slug}",
+    response_model=Union[ArticleResponse, ArticleWithAuthor],
+    responses={304: {"description": "Статья не изменилась"}},
+)
+async def get_article(
+    slug: str,
+    include: Optional[Literal["author"]] = Query(
+        None, description="Встроить профиль автора"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    # primary: статья попадает в общий кеш, и версия с отстающей реплики
+    # жила бы в нём до истечения TTL
+    db: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """Получить статью по slug
+
+    Ответ содержит `ETag`; если он совпадает с `If-None-Match`,
+    возвращается `304 Not Modified` без тела. С `include=author` ответ
+    содержит `author` — профиль автора — и отдаётся без `ETag`: профиль
+    меняется независимо от статьи.
+    """
     controller = ArticleController(db)
-    article = await controller.get_article_by_slug(slug)
-    return article
+    if include == "author":
+        return await controller.get_article_with_author(slug, loaders)
+    payload = await controller.get_article_payload(slug)
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, payload.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
 
 
 @router.put("/{slug}", response_model=ArticleResponse)
 async def update_article(
     slug: str,
     article_update: ArticleUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Обновить статью"""
@@ -57,7 +231,7 @@ async def update_article(
 @router.delete("/{slug}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_article(
     slug: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Удалить статью"""
@@ -1,16 +1,20 @@
-from typing import List
+from typing import List, Literal, Optional, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.controllers.comment import CommentController
-from src.core.database import get_db
-from src.dependencies import get_current_user
-from src.models.user import User
-from src.schemas.comment import CommentBase, CommentResponse
+from src.core.database import get_db, get_read_db
+from src.core.pagination import CursorKey
+from src.core.responses import route_class
+from src.dependencies import get_current_user, get_cursor, get_loaders
+from src.repositories.loaders import Loaders
+from src.schemas.comment import CommentBase, CommentResponse, CommentWithAuthor
+from src.schemas.pagination import Page
+from src.schemas.user import UserPrincipal
 
-router = APIRouter(prefix="/api/articles", tags=["comments"])
+router = APIRouter(prefix="/api/articles", tags=["comments"], route_class=route_class)
 
 
 @router.post(
@@ -21,7 +25,7 @@ router = APIRouter(prefix="/api/articles", tags=["comments"])
 async def create_comment(
     slug: str,
     comment_in: CommentBase,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Добавить комментарий к статье"""
@@ -29,23 +33,47 @@ async def create_comment(
     return await controller.create_comment(slug, comment_in, current_user.id)
 
 
-@router.get("/{slug}/comments", response_model=List[CommentResponse])
+@router.get(
+    "/{slug}/comments",
+    response_model=Union[
+        List[CommentResponse],
+        List[CommentWithAuthor],
+        Page[CommentResponse],
+        Page[CommentWithAuthor],
+    ],
+)
 async def get_comments(
     slug: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    pagination: Literal["offset", "cursor"] = Query("offset"),
+    include: Optional[Literal["author"]] = Query(
+        None, description="Встроить профили авторов"
+    ),
+    after: Optional[CursorKey] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    """Получить комментарии статьи"""
+    """Получить комментарии статьи
+
+    С `pagination=cursor` (или с переданным `cursor`) возвращает страницу
+    с `next_cursor` вместо списка. С `include=author` у каждого комментария
+    есть `author` — профиль автора; авторы читаются одним запросом.
+    """
     controller = CommentController(db)
-    return await controller.get_article_comments(slug, skip, limit)
+    author_loaders = loaders if include == "author" else None
+    if pagination == "cursor" or after is not None:
+        return await controller.get_article_comments_page(
+            slug, after, limit, author_loaders
+        )
+    return await controller.get_article_comments(slug, skip, limit, author_loaders)
 
 
 @router.delete("/{slug}/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_comment(
     slug: str,
     comment_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Удалить комментарий"""
@@ -0,0 +1,21 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.controllers.tag import TagController
+from src.core.database import get_read_db
+from src.core.responses import route_class
+from src.schemas.tag import TagResponse
+
+router = APIRouter(prefix="/api/tags", tags=["tags"], route_class=route_class)
+
+
+@router.get("/", response_model=List[TagResponse])
+async def get_tags(
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Получить популярные теги с числом статей"""
+    controller = TagController(db)
+    return await controller.get_tags(limit)
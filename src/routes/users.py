@@ -1,14 +1,19 @@
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.controllers.user import UserController
-from src.core.database import get_db
-from src.dependencies import get_current_user
-from src.models.user import User
-from src.schemas.user import (UserCreate, UserLogin, UserLoginResponse,
+from src.core.database import get_db, get_read_db
+from src.core.responses import route_class
+from src.dependencies import get_current_user, get_loaders
+from src.repositories.loaders import Loaders
+from src.schemas.batch import Batch
+from src.schemas.user import (UserBatchRequest, UserCreate, UserLogin,
+                              UserLoginResponse, UserPrincipal, UserProfile,
                               UserResponse, UserUpdate)
 
-router = APIRouter(prefix="/api/users", tags=["users"])
+router = APIRouter(prefix="/api/users", tags=["users"], route_class=route_class)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -26,8 +31,26 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     return await controller.login(credentials)
 
 
+@router.post("/batch", response_model=Batch[UserProfile, UUID])
+async def get_users_batch(
+    batch: UserBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """Профили пользователей по списку id
+
+    Все профили читаются одним запросом, повторные id — один раз.
+    `items` идут в порядке `ids`, на месте ненайденных — `null`,
+    ненайденные id перечислены в `missing`.
+    """
+    controller = UserController(db)
+    return await controller.get_profiles(batch.ids, loaders)
+
+
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: UserPrincipal = Depends(get_current_user),
+):
     """Получить информацию о текущем пользователе"""
     return current_user
 
@@ -35,7 +58,7 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 @router.put("/me", response_model=UserResponse)
 async def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Обновить информацию о текущем пользователе"""
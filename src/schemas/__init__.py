@@ -1,10 +1,11 @@
-from .article import ArticleCreate, ArticleUpdate
+from .article import ArticleCreate, ArticleUpdate, ArticleUpdateDB
 from .comment import CommentCreate
 from .user import UserCreate, UserLogin, UserUpdate
 
 __all__ = [
     "ArticleCreate",
     "ArticleUpdate",
+    "ArticleUpdateDB",
     "CommentCreate",
     "UserCreate",
     "UserLogin",
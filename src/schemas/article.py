@@ -1,11 +1,19 @@
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (BaseModel, ConfigDict, Field, field_validator,
+                      model_validator)
 
-if TYPE_CHECKING:
-    from src.schemas.user import UserResponse
+from src.schemas.batch import BATCH_MAX_SIZE
+from src.schemas.user import UserProfile
+
+
+def normalize_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    """Убрать пробелы по краям, пустые теги и повторы (порядок сохраняется)"""
+    if tags is None:
+        return None
+    return [tag for tag in dict.fromkeys(tag.strip() for tag in tags) if tag]
 
 
 class ArticleBase(BaseModel):
@@ -16,13 +24,15 @@ class ArticleBase(BaseModel):
     body: str = Field(...)
     tag_list: Optional[List[str]] = None
 
+    _normalize_tags = field_validator("tag_list")(normalize_tags)
+
 
 class ArticleCreate(ArticleBase):
     """Схема для создания статьи"""
 
     slug: str
     author_id: UUID
-    tag_list: Optional[str] = None
+    tag_list: List[str] = Field(default_factory=list)
 
     pass
 
@@ -35,6 +45,59 @@ class ArticleUpdate(BaseModel):
     body: Optional[str] = None
     tag_list: Optional[List[str]] = None
 
+    _normalize_tags = field_validator("tag_list")(normalize_tags)
+
+
+class ArticleUpdateDB(BaseModel):
+    """Схема для обновления статьи в БД"""
+
+    title: Optional[str] = None
+    slug: Optional[str] = None
+    description: Optional[str] = None
+    body: Optional[str] = None
+    tag_list: Optional[List[str]] = None
+
+
+class ArticleSummaryResponse(BaseModel):
+    """Схема краткого ответа статьи (без body) для списков"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    slug: str
+    title: str
+    description: str
+    tag_list: Optional[List[str]] = None
+    author_id: Optional[UUID]
+    created_at: datetime
+    updated_at: Optional[datetime]
+
+
+class ArticleSummaryWithAuthor(ArticleSummaryResponse):
+    """Краткий ответ статьи с профилем автора (include=author)"""
+
+    author: Optional[UserProfile] = None
+
+
+class ArticleSearchHit(ArticleSummaryResponse):
+    """Схема результата полнотекстового поиска"""
+
+    rank: float
+    headline: str
+
+
+class ArticleBatchRequest(BaseModel):
+    """Запрос статей по списку id или slug (что-то одно)"""
+
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=BATCH_MAX_SIZE)
+    slugs: Optional[List[str]] = Field(None, min_length=1, max_length=BATCH_MAX_SIZE)
+
+    @model_validator(mode="after")
+    def _one_key_kind(self) -> "ArticleBatchRequest":
+        if (self.ids is None) == (self.slugs is None):
+            raise ValueError("Нужно передать либо ids, либо slugs")
+        return self
+
 
 class ArticleResponse(ArticleBase):
     """Схема ответа статьи"""
@@ -44,3 +107,35 @@ class ArticleResponse(ArticleBase):
     author_id: Optional[UUID]
     created_at: datetime
     updated_at: Optional[datetime]
+
+
+class ArticleWithAuthor(ArticleResponse):
+    """Ответ статьи с профилем автора (include=author)"""
+
+    author: Optional[UserProfile] = None
+
+
+class ArticleImportError(BaseModel):
+    """Ошибка импорта одной строки NDJSON"""
+
+    line: int
+    error: str
+
+
+class ArticleImportReport(BaseModel):
+    """Итог массового импорта статей"""
+
+    imported: int = 0
+    failed: int = 0
+    errors: List[ArticleImportError] = Field(default_factory=list)
+    # В errors попадают только первые ошибки, failed считает все
+    errors_truncated: bool = False
+    elapsed_seconds: float = 0
+    rows_per_second: float = 0
+
+
+class ArticleExportLine(BaseModel):
+    """Строка NDJSON-выгрузки статей"""
+
+    cursor: str
+    article: ArticleResponse
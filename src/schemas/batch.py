@@ -0,0 +1,20 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+# Максимум ключей в одном пакетном запросе
+BATCH_MAX_SIZE = 500
+
+
+class Batch(BaseModel, Generic[T, K]):
+    """Результат пакетного запроса
+
+    items идут в порядке запрошенных ключей, на месте ненайденного — null;
+    missing перечисляет ненайденные ключи.
+    """
+
+    items: List[Optional[T]]
+    missing: List[K]
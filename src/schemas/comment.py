@@ -4,6 +4,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from src.schemas.user import UserProfile
+
 
 class CommentBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -26,3 +28,16 @@ class CommentResponse(CommentBase):
     author_id: UUID
     created_at: datetime
     updated_at: Optional[datetime]
+
+
+class CommentWithAuthor(CommentResponse):
+    """Ответ комментария с профилем автора (include=author)"""
+
+    author: Optional[UserProfile] = None
+
+
+class CommentExportLine(BaseModel):
+    """Строка NDJSON-выгрузки комментариев"""
+
+    cursor: str
+    comment: CommentResponse
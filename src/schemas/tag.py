@@ -0,0 +1,10 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class TagResponse(BaseModel):
+    """Схема ответа тега"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    articles_count: int
@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
+from src.schemas.batch import BATCH_MAX_SIZE
+
 
 class UserBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -44,6 +46,29 @@ class UserResponse(UserBase):
     updated_at: Optional[datetime] = None
 
 
+class UserPrincipal(UserResponse):
+    """Аутентифицированный пользователь, не привязанный к сессии БД"""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class UserProfile(BaseModel):
+    """Публичный профиль пользователя (без email)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    username: str
+    bio: Optional[str] = None
+    image_url: Optional[str] = None
+
+
+class UserBatchRequest(BaseModel):
+    """Запрос профилей по списку id"""
+
+    ids: List[UUID] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+
+
 class UserLoginResponse(BaseModel):
     """Схема ответа при логине"""
 
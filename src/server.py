@@ -0,0 +1,94 @@
+"""Запуск приложения в production-режиме: python -m src.server
+
+Супервизор uvicorn запускает SERVER_WORKERS процессов (spawn), каждый из
+которых заново импортирует src.main:app и создаёт свой движок БД и пул
+соединений. Упавший или отработавший SERVER_MAX_REQUESTS воркер
+перезапускается. По SIGTERM воркеры перестают принимать соединения,
+ждут запросы в обработке до SERVER_GRACEFUL_TIMEOUT_SECONDS и закрывают
+пул в lifespan.
+
+Кеши в памяти процесса (бэкенд memory) сбрасываются только в воркере,
+обработавшем запись, поэтому несколько воркеров запускаются, только когда
+такие кеши выключены или кеши общие (см. process_local_caches).
+
+Модуль не импортирует приложение, чтобы супервизор не создавал движок.
+"""
+
+import logging
+import os
+from typing import List
+
+import uvicorn
+
+from src.core.config import settings
+
+APP = "src.main:app"
+
+logger = logging.getLogger(__name__)
+
+
+def default_workers() -> int:
+    """Число CPU, доступных процессу (с учётом cpuset контейнера)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def process_local_caches() -> List[str]:
+    """Включённые кеши, которые в других воркерах не сбрасываются при записи
+
+    С бэкендом redis все кеши общие для воркеров.
+    """
+    cache_settings = settings.cache_settings
+    if cache_settings.article_backend != "memory":
+        return []
+    caches = []
+    if cache_settings.article_ttl_seconds > 0:
+        caches.append("CACHE_ARTICLE_TTL_SECONDS > 0")
+    if cache_settings.principal_ttl_seconds > 0:
+        caches.append("CACHE_PRINCIPAL_TTL_SECONDS > 0")
+    if settings.database_settings.db_replica_urls:
+        # Отметки о записи для read-your-writes
+        caches.append("DB_REPLICA_URLS")
+    return caches
+
+
+def workers_count() -> int:
+    """SERVER_WORKERS или число CPU; один воркер при кешах в памяти процесса"""
+    workers = settings.server_settings.workers
+    local_caches = process_local_caches()
+    if workers is None:
+        if not local_caches:
+            return default_workers()
+        logger.warning(
+            "Starting a single worker: caches are process-local (%s)",
+            ", ".join(local_caches),
+        )
+        return 1
+    if workers > 1 and local_caches:
+        raise SystemExit(
+            f"SERVER_WORKERS={workers} with process-local caches "
+            f"({', '.join(local_caches)}): other workers would serve stale data. "
+            "Use CACHE_ARTICLE_BACKEND=redis."
+        )
+    return workers
+
+
+def run() -> None:
+    server_settings = settings.server_settings
+    uvicorn.run(
+        APP,
+        host=settings.api_settings.app_host,
+        port=settings.api_settings.app_port,
+        workers=workers_count(),
+        loop=server_settings.loop,
+        http=server_settings.http,
+        limit_max_requests=server_settings.max_requests,
+        limit_max_requests_jitter=server_settings.max_requests_jitter,
+        timeout_graceful_shutdown=server_settings.graceful_timeout_seconds,
+        timeout_keep_alive=server_settings.keep_alive_seconds,
+    )
+
+
+if __name__ == "__main__":
+    run()